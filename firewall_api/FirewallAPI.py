@@ -1,13 +1,26 @@
 # Standard library imports for core functionality
+import os                  # For common prefix of prefetched names
 import re                  # For hostname validation
+import threading           # For safe sharing of one client between threads
+import time                # For request phase timings
 import urllib.parse       # For URL parsing and validation
 import warnings          # For handling warning messages
 import xml.sax.saxutils  # For XML string escaping
+from concurrent.futures import ThreadPoolExecutor  # For sharded reads
 
 # Third-party imports for HTTP and XML operations
 import requests          # For HTTP requests
 import urllib3          # For HTTP/HTTPS related utilities
-import xmltodict        # For XML-dict conversion
+
+# Local imports
+from .cache import _copy  # For merging updates into copies of current records
+from .filters import Condition, plan  # For compound filter expressions
+from .models import EntityModel, model_for  # For reading entities as compact records
+from .pool import ConnectionCounters, CountingAdapter  # For connection pooling and reuse statistics
+from .retry import TRANSIENT_STATUSES  # For adaptive concurrency feedback
+from .xml_decoder import decode  # For response parsing (lxml when installed, else expat)
+from .xml_serializer import serialize  # For fast entity XML serialization
+from .xml_stream import ItemParser  # For incremental response parsing
 
 # Configure warnings handling
 # Suppress SyntaxWarning for invalid escape sequences
@@ -20,6 +33,24 @@ EQ = "="      # Equals operator
 NOT = "!="    # Not equals operator
 LIKE = "like" # Pattern matching operator
 
+# Batch operation settings
+BATCH_SIZE = 100                        # Default number of entities packed into one request
+SUCCESS_CODES = ("200", "202", "216")   # Per-entity status codes treated as success
+PREFETCH_EQ_LIMIT = 3                   # Up to this many names are prefetched with one EQ read each
+NO_RECORDS_MESSAGES = ("No. of records Zero.", "Number of records Zero.")  # Status text of empty reads
+
+# Connection pool settings
+POOL_CONNECTIONS = 1                    # Number of host connection pools kept
+POOL_MAXSIZE = 10                       # Connections kept open per host (raise it to the number of threads)
+
+# Form-encoded end of every request envelope
+REQUEST_BODY_END = urllib.parse.quote_plus("</Request>").encode()
+
+
+def entity_key_field(entity):
+    """Name of the field identifying an entity: RuleName for LocalServiceACL, Name for all others"""
+    return "RuleName" if entity == "LocalServiceACL" else "Name"
+
 
 class Firewall:
     """
@@ -27,10 +58,18 @@ class Firewall:
     Handles authentication, CRUD operations, and connection management.
     """
 
-    def __init__(self, username, password, hostname, port=4444, certificate_verify=True, timeout=30):
+    def __init__(self, username, password, hostname, port=4444, certificate_verify=True, timeout=30, cache=None,
+                 retry_policy=None, limiter=None, pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE,
+                 pool_block=False, keep_alive=True):
         """
         Initialize firewall connection with authentication and connection parameters.
         Validates all input parameters and sets up the HTTP session.
+        An optional ReadCache serves repeated reads and is invalidated by writes.
+        An optional RetryPolicy retries idempotent requests after transient failures, and an optional
+        AdaptiveLimiter bounds the requests in flight from all threads using this client.
+        One client may be shared by many threads: pool_maxsize connections per host are kept open for
+        reuse (with pool_block, threads wait for a free connection instead of opening extra ones), and
+        keep_alive=False closes every connection after its request.
         """
         # Input validation section
         # Validate username and password
@@ -59,6 +98,14 @@ class Firewall:
         except (TypeError, ValueError):
             raise ValueError("Timeout must be a valid number greater than 0")
 
+        # Validate connection pool sizes
+        try:
+            pool_connections, pool_maxsize = int(pool_connections), int(pool_maxsize)
+            if pool_connections < 1 or pool_maxsize < 1:
+                raise ValueError("Pool sizes must be greater than 0")
+        except (TypeError, ValueError):
+            raise ValueError("pool_connections and pool_maxsize must be valid numbers greater than 0")
+
         # Setup base URL for API endpoint
         self.url = f"https://{hostname}:{port}/webconsole/APIController"
 
@@ -66,9 +113,19 @@ class Firewall:
         escaped_password = xml.sax.saxutils.escape(password)
         self.xml_login = f"""<Login><Username>{username}</Username><Password>{escaped_password}</Password></Login>"""
 
+        # Pre-encode the constant start of every request body (form field name, envelope and login)
+        self._body_start = ("reqxml=" + urllib.parse.quote_plus(f"<Request>{self.xml_login}")).encode()
+
         # Initialize HTTP session
+        self._lock = threading.Lock()
+        self._connection_counters = ConnectionCounters()
         self.session = requests.Session()
         self._setup_certificate_verification(certificate_verify)
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.keep_alive = keep_alive
+        self.configure_pool()
 
         # Configure secure HTTP headers
         self.headers = {
@@ -77,10 +134,17 @@ class Firewall:
             "X-Frame-Options": "DENY",
             "X-XSS-Protection": "1; mode=block",
             "Strict-Transport-Security": "max-age=31536000; includeSubDomains",
+            "Content-Type": "application/x-www-form-urlencoded",
         }
+        if not keep_alive:
+            self.headers["Connection"] = "close"
 
         self.closed = False
         self.timeout = timeout
+        self.cache = cache
+        self.retry_policy = retry_policy
+        self.limiter = limiter
+        self._hooks = {"pre_request": [], "post_response": [], "error": []}
 
     def _setup_certificate_verification(self, certificate_verify):
         """Configure SSL certificate verification behavior"""
@@ -111,10 +175,12 @@ class Firewall:
 
     def close(self):
         """Clean up resources and close the session"""
-        if not self.closed and self.session is not None:
-            self.session.close()
-            self.session = None
+        with self._lock:
+            session, self.session = self.session, None
+            was_open = not self.closed and session is not None
             self.closed = True
+        if was_open:
+            session.close()
             return {
                 "status": "200",
                 "message": "Session closed successfully.",
@@ -126,9 +192,80 @@ class Firewall:
             "data": [],
         }
 
+    # Connection pool
+    def configure_pool(self, pool_connections=None, pool_maxsize=None, pool_block=None):
+        """
+        (Re)size the HTTPS connection pool. Arguments left as None keep their current values.
+        Idle connections of the previous pool are closed.
+        """
+        with self._lock:
+            if pool_connections is not None:
+                self.pool_connections = int(pool_connections)
+            if pool_maxsize is not None:
+                self.pool_maxsize = int(pool_maxsize)
+            if pool_block is not None:
+                self.pool_block = pool_block
+            previous = self._mount_pool()
+        if previous is not None:
+            previous.close()
+
+    def ensure_pool_size(self, pool_maxsize):
+        """
+        Grow the pool to at least pool_maxsize connections per host, for callers running that many
+        requests in parallel: with a smaller pool, connections beyond its size are discarded after each
+        request and every later request pays a new TCP connect and TLS handshake. The pool never shrinks
+        here, so other threads sharing the client keep their connections. Returns True if it was resized.
+        """
+        pool_maxsize = int(pool_maxsize)
+        with self._lock:
+            if self.pool_maxsize >= pool_maxsize:
+                return False
+            self.pool_maxsize = pool_maxsize
+            previous = self._mount_pool()
+        if previous is not None:
+            previous.close()
+        return True
+
+    def _mount_pool(self):
+        """Mount a connection pool with the current settings (caller holds _lock), returning the previous adapter"""
+        if self.session is None:
+            return None
+        previous = self.session.adapters.get("https://")
+        self.session.mount(
+            "https://",
+            CountingAdapter(
+                self._connection_counters,
+                pool_connections=self.pool_connections,
+                pool_maxsize=self.pool_maxsize,
+                pool_block=self.pool_block,
+                keep_alive=self.keep_alive,
+            ),
+        )
+        return previous
+
+    def connection_stats(self):
+        """
+        Connection reuse since the client was created: requests sent, connections opened (each one a
+        TCP connect and TLS handshake), requests that reused an open connection, and idle pooled connections.
+        """
+        counters = self._connection_counters
+        requests_sent, connections = counters.requests, counters.connects
+        session = self.session
+        adapter = session.adapters.get("https://") if session is not None else None
+        reused = max(0, requests_sent - connections)
+        return {
+            "requests": requests_sent,
+            "connections": connections,
+            "reused": reused,
+            "reuse_ratio": reused / requests_sent if requests_sent else 0.0,
+            "idle": adapter.idle_connections() if isinstance(adapter, CountingAdapter) else 0,
+        }
+
     # CRUD Operations
     def create(self, entity, entity_data):
         """Create a new entity in the firewall"""
+        if isinstance(entity_data, EntityModel):
+            entity_data = entity_data.to_dict()
         if not isinstance(entity_data, dict):
             return {
                 "status": "400",
@@ -139,52 +276,119 @@ class Firewall:
         if entity == "Services":
             entity_data = self._remove_spaces(entity_data)
 
-        xml_action = f"""<Set operation="add"><{entity}>{xmltodict.unparse(entity_data, full_document=False)}</{entity}></Set>"""
-        return self._perform_action(xml_action, entity)
+        xml_action = f"""<Set operation="add"><{entity}>{serialize(entity_data)}</{entity}></Set>"""
+        return self._perform_write(xml_action, entity)
 
-    def read(self, entity, filter_value=None, filter_criteria=LIKE, filter_key_field=None):
-        """Read entity/entities matching the filter criteria"""
-        inner_xml = ""
-        if filter_value:
-            key_field = filter_key_field or "Name"
-            inner_xml = f"""<Filter><key name="{key_field}" criteria="{filter_criteria}">{filter_value}</key></Filter>"""
+    def read(self, entity, filter_value=None, filter_criteria=LIKE, filter_key_field=None, fields=None, as_models=False):
+        """
+        Read entity/entities matching the filter criteria.
+        fields is an optional list of dotted paths (e.g. ["Name", "ServiceDetails.ServiceDetail.Protocol"]);
+        when given, only those elements of each entity are parsed and returned.
+        With as_models, entity types that have a record class in firewall_api.models are returned as
+        records built directly by the parser instead of dicts.
+        filter_value may also be a filter expression (see firewall_api.filters), e.g.
+        Key("Name", "Web", LIKE) & Key("HostType", "IP"); filter_criteria and filter_key_field are then ignored.
+        """
+        if isinstance(filter_value, Condition):
+            return self._read_expression(entity, filter_value, fields, as_models)
 
-        xml_action = f"""<Get><{entity}>{inner_xml}</{entity}></Get>"""
-        return self._perform_action(xml_action, entity)
+        model = model_for(entity) if as_models else None
+        cache_key = None
+        if self.cache is not None:
+            projection = (tuple(fields) if fields else None, model is not None)
+            if filter_value:
+                cache_key = (self.url, entity, filter_value, filter_criteria, filter_key_field or "Name", projection)
+            else:
+                cache_key = (self.url, entity, None, None, None, projection)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
 
-    def update(self, entity, entity_data, entity_name=None, entity_name_key="Name"):
-        """Update an existing entity with new data"""
-        if entity_name is None:
-            if entity_name_key not in entity_data:
-                return {
-                    "status": "400",
-                    "message": f"Entity data must contain '{entity_name_key}' field or provide entity_name parameter.",
-                    "data": [],
-                }
-            entity_name = entity_data[entity_name_key]
+        xml_action = f"""<Get><{entity}>{self._filter_xml(filter_value, filter_criteria, filter_key_field)}</{entity}></Get>"""
+        response = self._perform_action(xml_action, entity, idempotent=True, fields=fields, model=model)
 
-        existing_data = self.read(entity, entity_name, EQ, entity_name_key)
-        if existing_data["status"] != "216" or not existing_data["data"]:
-            return {
-                "status": "404",
-                "message": "Entity not found for update.",
-                "data": [],
-            }
-        if len(existing_data["data"]) > 1:
-            return {
-                "status": "400",
-                "message": "Multiple entities found for update. Provide a unique entity_name.",
-                "data": [],
-            }
+        if cache_key is not None and response["status"] in ("216", "526"):
+            self.cache.put(cache_key, response)
+        return response
 
-        current_entity = existing_data["data"][0]
-        updated_data = self._merge_entities(current_entity, entity_data)
+    def read_iter(self, entity, filter_value=None, filter_criteria=LIKE, filter_key_field=None, chunk_size=65536):
+        """
+        Read entity/entities matching the filter criteria, parsing the response incrementally.
+        On success "data" is a generator yielding one entity dict at a time, so memory use does not
+        grow with the number of records. Network errors while iterating are raised by the generator.
+        filter_value may also be a filter expression, as in read.
+        """
+        if isinstance(filter_value, Condition):
+            return self._read_iter_expression(entity, filter_value, chunk_size)
 
-        xml_action = f"""<Set operation="update"><{entity}>{xmltodict.unparse(updated_data, full_document=False)}</{entity}></Set>"""
-        return self._perform_action(xml_action, entity)
+        xml_action = f"""<Get><{entity}>{self._filter_xml(filter_value, filter_criteria, filter_key_field)}</{entity}></Get>"""
+        attempt = 1
+        while True:
+            response = self._perform_stream(xml_action, entity, chunk_size)
+            if not self._should_retry(response, attempt, True):
+                return response
+            self.retry_policy.sleep(attempt)
+            attempt += 1
+
+    def read_sharded(self, entity, shards=None, max_workers=4, fields=None, as_models=False):
+        """
+        Read a large table as several smaller reads sent in parallel over the client's session, so no
+        single response has to hold and parse the whole table. Each shard is a name substring (read
+        with LIKE) or a filter expression. The firewall only matches substrings, so shards may overlap:
+        records are merged in shard order and de-duplicated by name. Records matching no shard are
+        not returned, so the shards must cover the table (e.g. one per naming prefix).
+        Without shards, or when a shard read fails, the table is read once with read().
+        """
+        if not shards:
+            return self.read(entity, fields=fields, as_models=as_models)
+        try:
+            max_workers = int(max_workers)
+            if max_workers < 1:
+                raise ValueError("Workers must be greater than 0")
+        except (TypeError, ValueError):
+            return {"status": "400", "message": "max_workers must be a valid number greater than 0.", "data": []}
+
+        self.ensure_pool_size(max_workers)
+
+        def read_shard(shard):
+            if isinstance(shard, Condition):
+                return self.read(entity, shard, fields=fields, as_models=as_models)
+            return self.read(entity, shard, LIKE, entity_key_field(entity), fields=fields, as_models=as_models)
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(shards)), thread_name_prefix="Shard") as executor:
+            responses = list(executor.map(read_shard, shards))
+
+        data, seen = [], set()
+        for response in responses:
+            if response["status"] == "526":
+                continue
+            if response["status"] != "216":
+                return self.read(entity, fields=fields, as_models=as_models)
+            for record in response["data"]:
+                name = self._entity_name(record)
+                if name is not None:
+                    if name in seen:
+                        continue
+                    seen.add(name)
+                data.append(record)
+
+        if not data:
+            return {"status": "526", "message": "No matching records found.", "data": []}
+        return {"status": "216", "message": "Operation completed successfully.", "data": data}
+
+    def update(self, entity, entity_data, entity_name=None, entity_name_key="Name"):
+        """Update an existing entity with new data"""
+        error, updated_data = self._prepare_update(entity, entity_data, entity_name, entity_name_key)
+        if error:
+            return error
+
+        xml_action = f"""<Set operation="update"><{entity}>{serialize(updated_data)}</{entity}></Set>"""
+        return self._perform_write(xml_action, entity, idempotent=True)
 
     def delete(self, entity, filter_value, filter_criteria=EQ, filter_key_field=None):
         """Delete an entity matching the filter criteria"""
+        # Removing by exact name can safely be repeated after a transient failure
+        idempotent = entity in ("FirewallRule", "LocalServiceACL") or filter_criteria == EQ
         if entity == "FirewallRule":
             inner_xml = f"<Name>{filter_value}</Name>"
         elif entity == "LocalServiceACL":
@@ -194,7 +398,83 @@ class Firewall:
             inner_xml = f'<Filter><key name="{key_field}" criteria="{filter_criteria}">{filter_value}</key></Filter>'
 
         xml_action = f"""<Remove><{entity}>{inner_xml}</{entity}></Remove>"""
-        return self._perform_action(xml_action, entity)
+        return self._perform_write(xml_action, entity, idempotent=idempotent)
+
+    # Batch operations
+    def create_many(self, entity, items, batch_size=BATCH_SIZE):
+        """Create many entities, packing up to batch_size of them into each Set request"""
+        items = list(items)
+        results = [None] * len(items)
+        pending = []
+        for index, entity_data in enumerate(items):
+            if isinstance(entity_data, EntityModel):
+                entity_data = entity_data.to_dict()
+            if not isinstance(entity_data, dict):
+                results[index] = self._item_result(None, "400", "entity_data must be a dictionary.")
+                continue
+            if entity == "Services":
+                entity_data = self._remove_spaces(entity_data)
+            xml_entity = f"""<{entity}>{serialize(entity_data)}</{entity}>"""
+            pending.append((index, self._entity_name(entity_data), xml_entity))
+
+        self._perform_batch(entity, """<Set operation="add">""", "</Set>", pending, results, batch_size, idempotent=False)
+        return self._batch_result(results)
+
+    def update_many(self, entity, items, entity_name_key="Name", batch_size=BATCH_SIZE, current=None):
+        """
+        Update many existing entities, packing up to batch_size of them into each Set request.
+        The current state of all targets is fetched up front with one read (or one per name for
+        a handful of items) instead of one read per item. Pass current to reuse records already read.
+        """
+        items = list(items)
+        results = [None] * len(items)
+        targets = []
+        for index, entity_data in enumerate(items):
+            if isinstance(entity_data, EntityModel):
+                entity_data = entity_data.to_dict()
+            if not isinstance(entity_data, dict):
+                results[index] = self._item_result(None, "400", "entity_data must be a dictionary.")
+            elif entity_name_key not in entity_data:
+                message = f"Entity data must contain '{entity_name_key}' field or provide entity_name parameter."
+                results[index] = self._item_result(None, "400", message)
+            else:
+                targets.append((index, entity_data))
+
+        names = {entity_data[entity_name_key] for _, entity_data in targets}
+        if current is None:
+            error, existing = self._prefetch(entity, names, entity_name_key)
+        else:
+            error, existing = None, self._index_entities(current, names, entity_name_key)
+
+        pending = []
+        for index, entity_data in targets:
+            name = entity_data[entity_name_key]
+            if error:
+                results[index] = self._item_result(name, error["status"], error["message"])
+            elif not existing.get(name):
+                results[index] = self._item_result(name, "404", "Entity not found for update.")
+            elif len(existing[name]) > 1:
+                results[index] = self._item_result(name, "400", "Multiple entities found for update. Provide a unique entity_name.")
+            else:
+                # Merge into a copy: current records passed in by the caller must stay unchanged
+                updated_data = self._merge_entities(_copy(existing[name][0]), entity_data)
+                xml_entity = f"""<{entity}>{serialize(updated_data)}</{entity}>"""
+                pending.append((index, name, xml_entity))
+
+        self._perform_batch(entity, """<Set operation="update">""", "</Set>", pending, results, batch_size, idempotent=True)
+        return self._batch_result(results)
+
+    def delete_many(self, entity, names, batch_size=BATCH_SIZE):
+        """Delete many entities by exact name, packing up to batch_size of them into each Remove request"""
+        key_field = entity_key_field(entity)
+        pending = [
+            (index, name, f"<{entity}><{key_field}>{xml.sax.saxutils.escape(str(name))}</{key_field}></{entity}>")
+            for index, name in enumerate(names)
+        ]
+        results = [None] * len(pending)
+
+        self._perform_batch(entity, "<Remove>", "</Remove>", pending, results, batch_size, idempotent=True)
+        return self._batch_result(results)
 
     # Helper methods
     def _is_valid_hostname(self, hostname):
@@ -242,16 +522,20 @@ class Firewall:
                         "message": entity_data["Status"]["#text"],
                         "data": [],
                     }
-                elif entity_data["Status"] in ["No. of records Zero.", "Number of records Zero."]:
+                elif entity_data["Status"] in NO_RECORDS_MESSAGES:
                     return {
                         "status": "526",
                         "message": "No matching records found.",
                         "data": [],
                     }
 
-            entity_data = [entity_data] if isinstance(entity_data, dict) else entity_data
+            entity_data = entity_data if isinstance(entity_data, list) else [entity_data]
 
-            entity_data = [{k: v for k, v in item.items() if k != "@transactionid"} for item in entity_data]
+            # Records built by the parser never get the transactionid attribute
+            entity_data = [
+                item if isinstance(item, EntityModel) else {k: v for k, v in item.items() if k != "@transactionid"}
+                for item in entity_data
+            ]
 
             return {
                 "status": "216",
@@ -265,8 +549,268 @@ class Firewall:
             "data": [],
         }
 
-    def _perform_action(self, xml_action, entity):
-        """Execute API request and handle response/errors"""
+    def _perform_action(self, xml_action, entity, response_handler=None, idempotent=False, fields=None, model=None):
+        """Execute API request, retrying idempotent requests after transient failures"""
+        attempt = 1
+        while True:
+            result = self._send_action(xml_action, entity, response_handler, fields, model)
+            if not self._should_retry(result, attempt, idempotent):
+                return result
+            self.retry_policy.sleep(attempt)
+            attempt += 1
+
+    def _should_retry(self, result, attempt, idempotent):
+        """Check whether a failed request may be sent again"""
+        return idempotent and self.retry_policy is not None and self.retry_policy.should_retry(result, attempt)
+
+    def _send_action(self, xml_action, entity, response_handler=None, fields=None, model=None):
+        """Send one API request and handle response/errors"""
+        error = self._check_connection()
+        if error:
+            return error
+        session = self.session
+        if session is None:
+            return self._check_connection()  # Closed by another thread
+
+        event = self._start_event(xml_action, entity)
+        started = time.perf_counter()
+        request_body = self._request_body(xml_action)
+        event["request_bytes"] = len(request_body)
+        event["timings"]["build"] = time.perf_counter() - started
+        self._emit("pre_request", event)
+
+        result = None
+        self._acquire_slot()
+        try:
+            phase_started = time.perf_counter()
+            response = session.post(
+                self.url, headers=self.headers, data=request_body, timeout=self.timeout, verify=session.verify
+            )
+            response.raise_for_status()
+            event["response_bytes"] = len(response.content)
+            event["timings"]["post"], phase_started = self._phase_time(phase_started)
+
+            parsed_response = decode(response.content, entity, fields, model=model)
+            event["timings"]["parse"], phase_started = self._phase_time(phase_started)
+
+            if response_handler is not None:
+                result = response_handler(parsed_response)
+            else:
+                result = self._format_xml_response(parsed_response, entity)
+            event["timings"]["format"], _ = self._phase_time(phase_started)
+        except requests.RequestException as e:
+            result = self._request_error(e)
+            event["error"] = e
+            self._release_slot(result, started)
+            self._finish_event("error", event, result, started)
+            return result
+        except Exception:
+            self._release_slot(None, started)
+            raise
+
+        self._release_slot(result, started)
+        self._finish_event("post_response", event, result, started)
+        return result
+
+    def _perform_write(self, xml_action, entity, response_handler=None, idempotent=False):
+        """Execute a write request and invalidate cached reads of the affected entity types"""
+        try:
+            return self._perform_action(xml_action, entity, response_handler, idempotent)
+        finally:
+            if self.cache is not None:
+                self.cache.invalidate(self.url, entity)
+
+    def _perform_stream(self, xml_action, entity, chunk_size):
+        """Execute API request and parse the response incrementally, one entity at a time"""
+        error = self._check_connection()
+        if error:
+            return error
+        session = self.session
+        if session is None:
+            return self._check_connection()  # Closed by another thread
+
+        event = self._start_event(xml_action, entity)
+        event["stream"] = True
+        started = time.perf_counter()
+        request_body = self._request_body(xml_action)
+        event["request_bytes"] = len(request_body)
+        event["timings"]["build"] = time.perf_counter() - started
+        self._emit("pre_request", event)
+
+        response = None
+        self._acquire_slot()
+        try:
+            phase_started = time.perf_counter()
+            response = session.post(
+                self.url,
+                headers=self.headers,
+                data=request_body,
+                timeout=self.timeout,
+                verify=session.verify,
+                stream=True,
+            )
+            response.raise_for_status()
+            event["timings"]["post"], phase_started = self._phase_time(phase_started)
+
+            chunks = response.iter_content(chunk_size)
+            parser = ItemParser()
+            name, first_item = self._next_stream_item(parser, chunks, entity)
+            event["timings"]["first_item"], _ = self._phase_time(phase_started)
+        except requests.RequestException as e:
+            if response is not None:
+                response.close()
+            result = self._request_error(e)
+            event["error"] = e
+            self._release_slot(result, started)
+            self._finish_event("error", event, result, started)
+            return result
+        except Exception:
+            if response is not None:
+                response.close()
+            self._release_slot(None, started)
+            raise
+
+        # The slot covers the request up to the first record; the rest of the body streams afterwards
+        self._release_slot({"status": "216"}, started)
+
+        # Anything but an entity record means the whole response is a status
+        if name != entity or self._is_status_record(first_item):
+            response.close()
+            result = self._format_xml_response({"Response": {name: first_item} if name else {}}, entity)
+        else:
+            result = {
+                "status": "216",
+                "message": "Operation completed successfully.",
+                "data": self._stream_items(first_item, parser, chunks, entity, response),
+            }
+
+        # Streamed bodies are not fully read yet, so the size is only known from Content-Length
+        event["response_bytes"] = int(response.headers.get("Content-Length") or 0)
+        self._finish_event("post_response", event, result, started)
+        return result
+
+    def _next_stream_item(self, parser, chunks, entity):
+        """
+        Advance the parser to the next entity record, Status or failed Login element.
+        Returns (element name, value), or (None, None) when the document ended.
+        """
+        while True:
+            while parser.items:
+                name, value = parser.items.popleft()
+                if name == entity and isinstance(value, dict):
+                    return name, value
+                if name == "Status":
+                    return name, value
+                if name == "Login" and isinstance(value, dict) and value.get("status") == "Authentication Failure":
+                    return name, value
+
+            chunk = next(chunks, None)
+            if chunk is None:
+                parser.close()
+                if not parser.items:
+                    return None, None
+            else:
+                parser.feed(chunk)
+
+    def _stream_items(self, first_item, parser, chunks, entity, response):
+        """Yield entity records from a streamed response, closing it when done"""
+        try:
+            name, item = entity, first_item
+            while name is not None:
+                if name == entity and not self._is_status_record(item):
+                    item.pop("@transactionid", None)
+                    yield item
+                name, item = self._next_stream_item(parser, chunks, entity)
+        finally:
+            response.close()
+
+    def _is_status_record(self, item):
+        """
+        Check whether an entity element holds a status rather than a record, as in _format_xml_response.
+        Records may have a Status field of their own (a FirewallRule's <Status>Enable</Status>).
+        """
+        status = item.get("Status")
+        if isinstance(status, dict):
+            return "@code" in status
+        return status in NO_RECORDS_MESSAGES
+
+    def _request_body(self, xml_action):
+        """Build the form-encoded request body for an API action from the pre-encoded envelope"""
+        return self._body_start + urllib.parse.quote_plus(xml_action).encode() + REQUEST_BODY_END
+
+    # Instrumentation hooks
+    def add_hook(self, event, callback):
+        """
+        Register a callback for "pre_request", "post_response" or "error" events.
+        The callback receives a dict with entity, operation, request_bytes, response_bytes,
+        status, elapsed and per-phase timings in seconds.
+        """
+        if event not in self._hooks:
+            raise ValueError(f"Unknown hook event '{event}'. Use one of: {', '.join(self._hooks)}")
+        if not callable(callback):
+            raise ValueError("Hook callback must be callable")
+        with self._lock:
+            # Replace rather than mutate the list so threads emitting events are not disturbed
+            self._hooks[event] = self._hooks[event] + [callback]
+
+    def remove_hook(self, event, callback):
+        """Unregister a callback added with add_hook"""
+        with self._lock:
+            if event in self._hooks and callback in self._hooks[event]:
+                callbacks = list(self._hooks[event])
+                callbacks.remove(callback)
+                self._hooks[event] = callbacks
+
+    def _start_event(self, xml_action, entity):
+        """Create the instrumentation event for a request"""
+        match = re.match(r'<(\w+)(?: operation="(\w+)")?', xml_action)
+        operation = (match.group(2) or match.group(1)).lower() if match else "unknown"
+        return {
+            "entity": entity,
+            "operation": operation,
+            "request_bytes": 0,
+            "response_bytes": 0,
+            "status": None,
+            "elapsed": 0.0,
+            "timings": {},
+        }
+
+    def _phase_time(self, phase_started):
+        """Return (seconds since phase_started, now)"""
+        now = time.perf_counter()
+        return now - phase_started, now
+
+    def _finish_event(self, name, event, result, started):
+        """Complete an instrumentation event with the result status and emit it"""
+        if isinstance(result, dict):
+            event["status"] = result["status"]
+        else:
+            # Batched responses carry one status per entity
+            event["status"] = "216" if all(item["status"] in SUCCESS_CODES for item in result) else "207"
+        event["elapsed"] = time.perf_counter() - started
+        self._emit(name, event)
+
+    def _emit(self, name, event):
+        """Call the hooks registered for an event; a failing hook only produces a warning"""
+        for callback in self._hooks[name]:
+            try:
+                callback(event)
+            except Exception as e:
+                warnings.warn(f"Hook {name} failed: {e}", UserWarning)
+
+    def _acquire_slot(self):
+        """Wait for a free request slot when an adaptive limiter is configured"""
+        if self.limiter is not None:
+            self.limiter.acquire()
+
+    def _release_slot(self, result, started):
+        """Return the request slot, reporting whether the request succeeded and how long it took"""
+        if self.limiter is not None:
+            success = result is not None and not (isinstance(result, dict) and result["status"] in TRANSIENT_STATUSES)
+            self.limiter.release(success, time.perf_counter() - started)
+
+    def _check_connection(self):
+        """Return an error status if the connection cannot be used, None otherwise"""
         if self.closed or self.session is None:
             return {
                 "status": "400",
@@ -280,15 +824,12 @@ class Firewall:
                 "message": "Invalid connection URL. Please check the hostname and port settings.",
                 "data": [],
             }
+        return None
 
-        full_request_xml = f"<Request>{self.xml_login}{xml_action}</Request>"
-
-        try:
-            response = self.session.post(self.url, headers=self.headers, data={"reqxml": full_request_xml}, timeout=self.timeout)
-            response.raise_for_status()
-            return self._format_xml_response(xmltodict.parse(response.content.decode()), entity)
-        except requests.exceptions.SSLError as e:
-            error_msg = str(e)
+    def _request_error(self, error):
+        """Translate a requests exception into a status response"""
+        if isinstance(error, requests.exceptions.SSLError):
+            error_msg = str(error)
             if "CERTIFICATE_VERIFY_FAILED" in error_msg and "self-signed certificate" in error_msg:
                 return {
                     "status": "495",
@@ -300,24 +841,234 @@ class Firewall:
                 "message": "Secure connection failed. Please check your SSL/TLS settings and certificate configuration.",
                 "data": [],
             }
-        except requests.exceptions.ConnectionError as e:
+        if isinstance(error, requests.exceptions.ConnectionError):
             return {
                 "status": "503",
                 "message": "Unable to connect to the server.\nPlease check your network connection and server availability.",
                 "data": [],
             }
-        except requests.exceptions.Timeout as e:
+        if isinstance(error, requests.exceptions.Timeout):
             return {
                 "status": "504",
                 "message": "The request timed out. Please check your connection and try again.",
                 "data": [],
             }
-        except requests.RequestException as e:
+        if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+            code = error.response.status_code
+            if code < 500:
+                # Client errors (wrong path, rejected request) will not succeed on retry
+                return {
+                    "status": str(code),
+                    "message": f"The server rejected the request (HTTP {code}). Please check the hostname, port and API settings.",
+                    "data": [],
+                }
             return {
                 "status": "500",
-                "message": "The request failed. Please check your connection settings and try again.",
+                "message": f"The server failed to handle the request (HTTP {code}). Please try again later.",
                 "data": [],
             }
+        return {
+            "status": "500",
+            "message": "The request failed. Please check your connection settings and try again.",
+            "data": [],
+        }
+
+    def _filter_xml(self, filter_value, filter_criteria, filter_key_field):
+        """Build the Filter element of a Get request"""
+        if not filter_value:
+            return ""
+        key_field = filter_key_field or "Name"
+        return f"""<Filter><key name="{key_field}" criteria="{filter_criteria}">{filter_value}</key></Filter>"""
+
+    def _read_expression(self, entity, expression, fields, as_models):
+        """Read the records matching a filter expression, sending the keys the firewall can evaluate"""
+        if fields:
+            # The fields the expression checks must be parsed too
+            fields = list(fields) + [field for field in expression.fields() if field not in fields]
+
+        reads = plan(expression)
+        data = []
+        for index, read in enumerate(reads):
+            response = self.read(entity, *self._key_arguments(read.key), fields=fields, as_models=as_models)
+            if response["status"] == "526":
+                continue
+            if response["status"] != "216":
+                return response
+            data.extend(self._select(response["data"], reads, index))
+
+        if not data:
+            return {"status": "526", "message": "No matching records found.", "data": []}
+        return {"status": "216", "message": "Operation completed successfully.", "data": data}
+
+    def _read_iter_expression(self, entity, expression, chunk_size):
+        """Stream the records matching a filter expression; later reads are sent while iterating"""
+        reads = plan(expression)
+        for index, read in enumerate(reads):
+            response = self.read_iter(entity, *self._key_arguments(read.key), chunk_size=chunk_size)
+            if response["status"] == "216":
+                return dict(response, data=self._stream_expression(entity, reads, index, response["data"], chunk_size))
+            if response["status"] != "526":
+                return response
+        return response
+
+    def _stream_expression(self, entity, reads, first, records, chunk_size):
+        """Yield the selected records of reads[first:], the first of which is already streaming"""
+        for index in range(first, len(reads)):
+            if index > first:
+                response = self.read_iter(entity, *self._key_arguments(reads[index].key), chunk_size=chunk_size)
+                if response["status"] == "526":
+                    continue
+                if response["status"] != "216":
+                    raise requests.RequestException(f"Filtered read failed: {response['status']} {response['message']}")
+                records = response["data"]
+            yield from self._select(records, reads, index)
+
+    def _select(self, records, reads, index):
+        """
+        Records of reads[index] that satisfy its residual filter. Records an earlier read already
+        returned are skipped, so overlapping reads do not produce duplicates.
+        """
+        residual = reads[index].residual
+        earlier = [read.condition for read in reads[:index]]
+        for record in records:
+            if (residual is None or residual.matches(record)) and not any(condition.matches(record) for condition in earlier):
+                yield record
+
+    def _key_arguments(self, key):
+        """filter_value, filter_criteria and filter_key_field of a planned Filter key (None reads all)"""
+        if key is None:
+            return None, LIKE, None
+        return key.value, key.criteria, key.field
+
+    def _prepare_update(self, entity, entity_data, entity_name, entity_name_key):
+        """Read the current entity and merge new data into it, returning (error, merged data)"""
+        if entity_name is None:
+            if entity_name_key not in entity_data:
+                return {
+                    "status": "400",
+                    "message": f"Entity data must contain '{entity_name_key}' field or provide entity_name parameter.",
+                    "data": [],
+                }, None
+            entity_name = entity_data[entity_name_key]
+
+        existing_data = self.read(entity, entity_name, EQ, entity_name_key)
+        if existing_data["status"] != "216" or not existing_data["data"]:
+            return {
+                "status": "404",
+                "message": "Entity not found for update.",
+                "data": [],
+            }, None
+        if len(existing_data["data"]) > 1:
+            return {
+                "status": "400",
+                "message": "Multiple entities found for update. Provide a unique entity_name.",
+                "data": [],
+            }, None
+
+        current_entity = existing_data["data"][0]
+        return None, self._merge_entities(current_entity, entity_data)
+
+    def _prefetch(self, entity, names, key_field):
+        """
+        Read the current records for a set of names, returning (error, {name: [records]}).
+        A few names are read with one EQ filter each; more are read in a single request filtered
+        by their common prefix (or unfiltered), keeping only the wanted records while streaming.
+        """
+        if not names:
+            return None, {}
+
+        if len(names) <= PREFETCH_EQ_LIMIT:
+            existing = {}
+            for name in names:
+                response = self.read(entity, name, EQ, key_field)
+                if response["status"] not in ("216", "526"):
+                    return response, None
+                existing.update(self._index_entities(response["data"], {name}, key_field))
+            return None, existing
+
+        prefix = os.path.commonprefix([str(name) for name in names])
+        response = self.read_iter(entity, prefix or None, LIKE, key_field)
+        if response["status"] == "526":
+            return None, {}
+        if response["status"] != "216":
+            return response, None
+        return None, self._index_entities(response["data"], names, key_field)
+
+    def _index_entities(self, records, names, key_field):
+        """Group the records whose key field is one of names by that key"""
+        existing = {}
+        for record in records:
+            name = record.get(key_field)
+            if name in names:
+                existing.setdefault(name, []).append(record)
+        return existing
+
+    def _perform_batch(self, entity, xml_open, xml_close, pending, results, batch_size, idempotent=False):
+        """Send pending (index, name, xml) items in chunks and store per-item results"""
+        try:
+            batch_size = int(batch_size)
+        except (TypeError, ValueError):
+            batch_size = 0
+        if batch_size < 1:
+            for index, name, _ in pending:
+                results[index] = self._item_result(name, "400", "batch_size must be a number greater than 0.")
+            return
+
+        for start in range(0, len(pending), batch_size):
+            chunk = pending[start:start + batch_size]
+            xml_action = xml_open + "".join(xml_entity for _, _, xml_entity in chunk) + xml_close
+            response = self._perform_write(
+                xml_action,
+                entity,
+                lambda parsed, count=len(chunk): self._format_batch_response(parsed, entity, count),
+                idempotent,
+            )
+            # A single status dict means the whole request failed before per-entity statuses were returned
+            statuses = [response] * len(chunk) if isinstance(response, dict) else response
+            for (index, name, _), status in zip(chunk, statuses):
+                results[index] = self._item_result(name, status["status"], status["message"])
+
+    def _format_batch_response(self, response, entity, count):
+        """Map the per-entity statuses of a batched response back to the request items"""
+        entity_data = response.get("Response", {}).get(entity)
+        if entity_data is None:
+            return [self._format_xml_response(response, entity)] * count
+
+        entity_data = [entity_data] if isinstance(entity_data, dict) else entity_data
+        statuses = []
+        for item in entity_data:
+            status = item.get("Status") if isinstance(item, dict) else None
+            if isinstance(status, dict) and "@code" in status:
+                statuses.append({"status": status["@code"], "message": status.get("#text", "")})
+            else:
+                statuses.append({"status": "500", "message": "Unexpected response for entity in batch."})
+
+        # Pad if the firewall returned fewer statuses than entities sent
+        missing = {"status": "500", "message": "No status returned for entity in batch."}
+        return (statuses + [missing] * count)[:count]
+
+    def _item_result(self, name, status, message):
+        """Build a per-item result entry for batch operations"""
+        return {"name": name, "status": status, "message": message}
+
+    def _batch_result(self, results):
+        """Summarize per-item results of a batch operation"""
+        failed = sum(1 for result in results if result["status"] not in SUCCESS_CODES)
+        if not failed:
+            return {
+                "status": "216",
+                "message": f"Operation completed successfully for {len(results)} entities.",
+                "data": results,
+            }
+        return {
+            "status": "207",
+            "message": f"Operation failed for {failed} of {len(results)} entities.",
+            "data": results,
+        }
+
+    def _entity_name(self, entity_data):
+        """Return the identifying name of an entity payload"""
+        return entity_data.get("Name", entity_data.get("RuleName"))
 
     def _merge_entities(self, current_entity, new_entity):
         """Deep merge two entity dictionaries"""
@@ -1 +1,16 @@
 from .FirewallAPI import Firewall, LIKE, NOT, EQ
+from .async_firewall import AsyncFirewall
+from .fleet import FirewallFleet, load_connections
+from .cache import ReadCache
+from .sync import SyncEngine
+from .ip_index import IPHostIndex
+from .metrics import MetricsCollector
+from .retry import AdaptiveLimiter, RetryPolicy
+from .snapshot import SnapshotStore
+from .exporter import Exporter, ExportReader
+from .brute_force import BruteForceDetector
+from .models import EntityModel
+from .filters import Key, And, Or
+from .jobs import JobRunner
+from .scheduler import WriteScheduler
+from .rule_analyzer import RuleAnalyzer
@@ -0,0 +1,96 @@
+# Standard library imports for asyncio support
+import asyncio              # For awaiting blocking calls from coroutines
+import functools            # For binding call arguments
+from concurrent.futures import ThreadPoolExecutor  # For running blocking requests off the event loop
+
+# Local imports
+from .FirewallAPI import Firewall, BATCH_SIZE, EQ, LIKE
+
+
+class AsyncFirewall:
+    """
+    Asyncio counterpart of the Firewall class.
+    Exposes the same CRUD surface and result format, running requests on a bounded worker pool
+    so several requests to one firewall can be in flight at the same time.
+    """
+
+    def __init__(self, username, password, hostname, port=4444, certificate_verify=True, timeout=30, max_concurrency=4, cache=None,
+                 retry_policy=None, limiter=None):
+        """
+        Initialize the underlying Firewall client and the in-flight request limit.
+        max_concurrency is the number of requests allowed in flight at the same time; an optional
+        AdaptiveLimiter lowers that number while the firewall is struggling.
+        """
+        try:
+            max_concurrency = int(max_concurrency)
+            if max_concurrency < 1:
+                raise ValueError("Concurrency limit must be greater than 0")
+        except (TypeError, ValueError):
+            raise ValueError("max_concurrency must be a valid number greater than 0")
+
+        self.firewall = Firewall(
+            username, password, hostname, port, certificate_verify, timeout, cache, retry_policy, limiter, pool_maxsize=max_concurrency
+        )
+        self.max_concurrency = max_concurrency
+
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="AsyncFirewall")
+
+    # Resource management methods
+    async def __aenter__(self):
+        """Async context manager entry point"""
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        """Async context manager exit point - ensures proper cleanup"""
+        await self.close()
+
+    async def close(self):
+        """Clean up resources, close the session and stop the worker pool"""
+        result = await self._run(self.firewall.close)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        return result
+
+    # CRUD Operations
+    async def create(self, entity, entity_data):
+        """Create a new entity in the firewall"""
+        return await self._run(self.firewall.create, entity, entity_data)
+
+    async def read(self, entity, filter_value=None, filter_criteria=LIKE, filter_key_field=None, fields=None, as_models=False):
+        """Read entity/entities matching the filter criteria, optionally only the given fields or as records"""
+        return await self._run(self.firewall.read, entity, filter_value, filter_criteria, filter_key_field, fields, as_models)
+
+    async def read_sharded(self, entity, shards=None, max_workers=4, fields=None, as_models=False):
+        """Read a large table as several parallel shard reads, merged and de-duplicated by name"""
+        return await self._run(self.firewall.read_sharded, entity, shards, max_workers, fields, as_models)
+
+    async def update(self, entity, entity_data, entity_name=None, entity_name_key="Name"):
+        """Update an existing entity with new data"""
+        return await self._run(self.firewall.update, entity, entity_data, entity_name, entity_name_key)
+
+    async def delete(self, entity, filter_value, filter_criteria=EQ, filter_key_field=None):
+        """Delete an entity matching the filter criteria"""
+        return await self._run(self.firewall.delete, entity, filter_value, filter_criteria, filter_key_field)
+
+    # Batch operations
+    async def create_many(self, entity, items, batch_size=BATCH_SIZE):
+        """Create many entities using batched Set requests"""
+        return await self._run(self.firewall.create_many, entity, items, batch_size)
+
+    async def update_many(self, entity, items, entity_name_key="Name", batch_size=BATCH_SIZE):
+        """Update many existing entities using batched Set requests"""
+        return await self._run(self.firewall.update_many, entity, items, entity_name_key, batch_size)
+
+    async def delete_many(self, entity, names, batch_size=BATCH_SIZE):
+        """Delete many entities by exact name using batched Remove requests"""
+        return await self._run(self.firewall.delete_many, entity, names, batch_size)
+
+    # Helper methods
+    async def _run(self, func, *args):
+        """Run a blocking client call on the worker pool"""
+        if self._executor is None:
+            # Closed client - the call returns the "connection is closed" status without any I/O
+            return func(*args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args))
@@ -0,0 +1,214 @@
+# Standard library imports for benchmarking
+import argparse             # For command line options
+import gc                   # For stable memory measurements
+import multiprocessing      # For running the emulator outside the measured process
+import time                 # For timings
+import timeit               # For serializer microbenchmarks
+import tracemalloc          # For client-side peak memory
+
+# Third-party imports
+import xmltodict            # Reference serializer
+
+# Local imports
+from .FirewallAPI import EQ, Firewall
+from .emulator import FirewallEmulator
+from .xml_serializer import serialize
+
+# Benchmark defaults
+DEFAULT_SIZES = (1000, 10000, 100000)
+USERNAME = "benchmark"
+PASSWORD = "benchmark"
+
+
+def _serve(connection, latency):
+    """Run an emulator in a child process and report its port"""
+    emulator = FirewallEmulator(USERNAME, PASSWORD, latency=latency).start()
+    connection.send(emulator.port)
+    connection.recv()  # Block until the parent asks to stop
+    emulator.stop()
+
+
+def percentile(values, fraction):
+    """Return the value at a fraction (0-1) of the sorted values"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class RequestTimer:
+    """Record the latency of every request a Firewall client sends, using its instrumentation hooks"""
+
+    def __init__(self, firewall):
+        """Register the timer's hooks"""
+        self.latencies = []
+        firewall.add_hook("post_response", self.record)
+        firewall.add_hook("error", self.record)
+
+    def record(self, event):
+        """Store the latency of a completed request"""
+        self.latencies.append(event["elapsed"])
+
+    def reset(self):
+        """Forget recorded latencies"""
+        self.latencies = []
+
+
+def measure(name, size, timer, operation):
+    """Run an operation, returning a result row with throughput, latency and peak memory"""
+    gc.collect()
+    timer.reset()
+    tracemalloc.start()
+    started = time.perf_counter()
+    response = operation()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    requests_sent = len(timer.latencies)
+    return {
+        "operation": name,
+        "entities": size,
+        "status": response["status"] if isinstance(response, dict) else "-",
+        "requests": requests_sent,
+        "seconds": elapsed,
+        "requests_per_second": requests_sent / elapsed if elapsed else 0.0,
+        "entities_per_second": size / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(timer.latencies, 0.50) * 1000,
+        "p99_ms": percentile(timer.latencies, 0.99) * 1000,
+        "peak_mb": peak / 1024 / 1024,
+    }
+
+
+def run_size(firewall, timer, size, batch_size, sample, payload_size):
+    """Benchmark bulk and single-entity CRUD for one table size"""
+    hosts = [
+        {
+            "Name": f"Bench_{number}",
+            "IPFamily": "IPv4",
+            "HostType": "IP",
+            "IPAddress": f"10.{number >> 16 & 255}.{number >> 8 & 255}.{number & 255}",
+            "Description": "x" * payload_size,
+        }
+        for number in range(size)
+    ]
+    names = [host["Name"] for host in hosts]
+    updates = [{"Name": name, "Description": "y" * payload_size} for name in names]
+    sample = min(sample, size)
+
+    def consume_stream():
+        response = firewall.read_iter("IPHost")
+        count = sum(1 for _ in response["data"]) if response["status"] == "216" else 0
+        return {"status": response["status"], "count": count}
+
+    rows = [
+        measure("create_many", size, timer, lambda: firewall.create_many("IPHost", hosts, batch_size)),
+        measure("read", size, timer, lambda: firewall.read("IPHost")),
+        measure("read_iter", size, timer, consume_stream),
+        measure("update_many", size, timer, lambda: firewall.update_many("IPHost", updates, batch_size=batch_size)),
+        measure("read (EQ)", sample, timer, lambda: [firewall.read("IPHost", name, EQ) for name in names[:sample]][-1]),
+        measure("update", sample, timer, lambda: [firewall.update("IPHost", item) for item in updates[:sample]][-1]),
+        measure("delete", sample, timer, lambda: [firewall.delete("IPHost", name) for name in names[:sample]][-1]),
+        measure("create", sample, timer, lambda: [firewall.create("IPHost", host) for host in hosts[:sample]][-1]),
+        measure("delete_many", size, timer, lambda: firewall.delete_many("IPHost", names, batch_size)),
+    ]
+    return rows
+
+
+def print_rows(rows):
+    """Print result rows as a table"""
+    header = f"{'operation':<12} {'entities':>9} {'status':>6} {'requests':>8} {'seconds':>8} {'req/s':>9} {'ent/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'peak MB':>8}"
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        print(
+            f"{row['operation']:<12} {row['entities']:>9} {row['status']:>6} {row['requests']:>8} {row['seconds']:>8.2f} "
+            f"{row['requests_per_second']:>9.1f} {row['entities_per_second']:>10.1f} {row['p50_ms']:>8.2f} "
+            f"{row['p99_ms']:>8.2f} {row['peak_mb']:>8.2f}"
+        )
+
+
+def serializer_samples(count=100, payload_size=64):
+    """Entity dicts covering the shapes sent by the client, plus one batched Set of count IPHosts"""
+    return [
+        {"Name": "Host <1> & \"2\"", "IPFamily": "IPv4", "HostType": "IP", "IPAddress": "10.0.0.1", "Description": None},
+        {"Name": "Group", "HostList": {"Host": ["Host_1", "Host_2"]}, "Empty": [], "Flag": True, "Count": 3},
+        {
+            "Name": "Web",
+            "Type": "TCPorUDP",
+            "ServiceDetails": {
+                "ServiceDetail": [
+                    {"SourcePort": "1:65535", "DestinationPort": "80", "Protocol": "TCP"},
+                    {"SourcePort": "1:65535", "DestinationPort": "443", "Protocol": "TCP"},
+                ]
+            },
+        },
+        {"Name": "Rule", "Status": "Enable", "SourceZones": {"Zone": ["LAN", "DMZ"]}, "Note": {"@lang": "en\t'x'", "#text": "a > b"}},
+        {
+            "Set": {
+                "@operation": "add",
+                "IPHost": [
+                    {"Name": f"Host_{number}", "IPFamily": "IPv4", "HostType": "IP", "IPAddress": f"10.0.{number >> 8 & 255}.{number & 255}", "Description": "x" * payload_size}
+                    for number in range(count)
+                ],
+            }
+        },
+    ]
+
+
+def run_serializer(number=200):
+    """Compare the speed of serialize() and xmltodict.unparse(), returning result rows"""
+    rows = []
+    for sample in serializer_samples():
+        expected = xmltodict.unparse(sample, full_document=False)
+        reference = timeit.timeit(lambda: xmltodict.unparse(sample, full_document=False), number=number)
+        fast = timeit.timeit(lambda: serialize(sample), number=number)
+        rows.append({"bytes": len(expected), "xmltodict_us": reference / number * 1e6, "serialize_us": fast / number * 1e6})
+
+    print(f"{'bytes':>8} {'xmltodict us':>13} {'serialize us':>13} {'speedup':>8}")
+    for row in rows:
+        print(f"{row['bytes']:>8} {row['xmltodict_us']:>13.1f} {row['serialize_us']:>13.1f} {row['xmltodict_us'] / row['serialize_us']:>7.1f}x")
+    return rows
+
+
+def run(sizes=DEFAULT_SIZES, batch_size=100, sample=200, latency=0.0, payload_size=64):
+    """Start an emulator in a child process and benchmark the client against it, returning all rows"""
+    parent, child = multiprocessing.Pipe()
+    server = multiprocessing.Process(target=_serve, args=(child, latency), daemon=True)
+    server.start()
+    port = parent.recv()
+
+    rows = []
+    try:
+        with Firewall(USERNAME, PASSWORD, "localhost", port, certificate_verify=False, timeout=300) as firewall:
+            timer = RequestTimer(firewall)
+            for size in sizes:
+                size_rows = run_size(firewall, timer, size, batch_size, sample, payload_size)
+                print(f"\n=== {size} entities ===")
+                print_rows(size_rows)
+                rows.extend(size_rows)
+    finally:
+        parent.send("stop")
+        server.join(timeout=10)
+    return rows
+
+
+def main():
+    """Run the benchmark suite from the command line"""
+    parser = argparse.ArgumentParser(description="Benchmark the Firewall client against a local API emulator")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="Entity counts to benchmark")
+    parser.add_argument("--batch-size", type=int, default=100, help="Entities per batched request")
+    parser.add_argument("--sample", type=int, default=200, help="Entities used for single-request operations")
+    parser.add_argument("--latency", type=float, default=0.0, help="Emulated server latency in seconds")
+    parser.add_argument("--payload-size", type=int, default=64, help="Description length of every entity")
+    parser.add_argument("--serializer", action="store_true", help="Only time the request XML serializer")
+    args = parser.parse_args()
+
+    if args.serializer:
+        run_serializer()
+        return
+    run(args.sizes, args.batch_size, args.sample, args.latency, args.payload_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,384 @@
+# Standard library imports for log ingestion
+import argparse             # For command line options
+import collections          # For bounded per-address counters
+import datetime             # For log timestamps
+import gzip                 # For reading rotated, compressed logs
+import ipaddress            # For address validation and allowlists
+import os                   # For following rotated log files
+import re                   # For failure and timestamp patterns
+import time                 # For polling and flush intervals
+
+# Local imports
+from .FirewallAPI import Firewall, LIKE, SUCCESS_CODES
+from .fleet import CONNECTION_FIELDS, load_connections
+from .ip_importer import FAMILIES, HOST_PREFIX
+from .retry import TRANSIENT_STATUSES
+
+# Naming used by the "04. Brutal Force Block" notebook
+PREFIX = "BFA_"
+GROUP_NAME = f"{PREFIX}Brute-force attack Group"
+DESCRIPTION = "Added by the brute-force detector"
+
+# Authentication failure patterns; each captures the source address as "ip"
+FAILURE_PATTERNS = (
+    r"Failed (?:password|publickey) for (?:invalid user )?\S* ?from (?P<ip>[0-9A-Fa-f:.]+)",
+    r"Invalid user \S* ?from (?P<ip>[0-9A-Fa-f:.]+)",
+    r"authentication failure;.*\brhost=(?P<ip>[0-9A-Fa-f:.]+)",
+    # Sophos Firewall authentication and admin login events
+    r'(?=.*\bstatus="?Failed)(?=.*\bsrc_ip="?(?P<ip>[0-9A-Fa-f:.]+))',
+)
+
+# Timestamp formats: ISO 8601 (with an optional fraction and UTC offset) or a classic syslog
+# "Oct 17 01:00:00" prefix at the start of the line, or Sophos date=/time= fields
+ISO_TIMESTAMP = re.compile(r"^(\d{4}-\d{2}-\d{2})[T ](\d{2}:\d{2}:\d{2})(?:\.\d+)?(Z|[+-]\d{2}:?\d{2})?")
+SYSLOG_TIMESTAMP = re.compile(r"^([A-Z][a-z]{2}) +(\d{1,2}) (\d{2}:\d{2}:\d{2})\b")
+SOPHOS_TIMESTAMP = re.compile(r"\bdate=\"?(\d{4}-\d{2}-\d{2})\"? time=\"?(\d{2}:\d{2}:\d{2})")
+
+# Seconds syslog timestamps may run out of order (or ahead of the clock) without changing their year
+CLOCK_SKEW = 86400
+
+
+def parse_timestamp(line, reference=None):
+    """
+    Return the timestamp of a log line in seconds since the epoch, or None. Times without a UTC offset
+    are local time. Syslog timestamps have no year: with a reference (the previous line's timestamp)
+    the first year not before it is used, so a file running past New Year moves on to the next year;
+    without one, the latest year not after the current time.
+    """
+    match = ISO_TIMESTAMP.search(line)
+    if match:
+        offset = match.group(3) or ""
+        if offset == "Z":
+            offset = "+00:00"
+        elif offset and ":" not in offset:
+            offset = f"{offset[:3]}:{offset[3:]}"
+        try:
+            return datetime.datetime.fromisoformat(f"{match.group(1)}T{match.group(2)}{offset}").timestamp()
+        except ValueError:
+            return None
+
+    match = SYSLOG_TIMESTAMP.search(line)
+    if match:
+        return _syslog_timestamp(match, reference)
+
+    match = SOPHOS_TIMESTAMP.search(line)
+    if not match:
+        return None
+    try:
+        return datetime.datetime.strptime(f"{match.group(1)} {match.group(2)}", "%Y-%m-%d %H:%M:%S").timestamp()
+    except ValueError:
+        return None
+
+
+def _syslog_timestamp(match, reference):
+    """Timestamp of a syslog "Mon DD HH:MM:SS" match, inferring the year from reference (see parse_timestamp)"""
+    year = datetime.datetime.fromtimestamp(reference if reference is not None else time.time()).year
+    candidates = []
+    for candidate in (year - 1, year, year + 1):
+        try:
+            stamp = datetime.datetime.strptime(f"{candidate} {match.group(1)} {match.group(2)} {match.group(3)}", "%Y %b %d %H:%M:%S")
+        except ValueError:
+            continue  # Feb 29 outside a leap year, or not a month name
+        candidates.append(stamp.timestamp())
+    if not candidates:
+        return None
+    if reference is not None:
+        later = [stamp for stamp in candidates if stamp >= reference - CLOCK_SKEW]
+        return min(later) if later else max(candidates)
+    now = time.time()
+    past = [stamp for stamp in candidates if stamp <= now + CLOCK_SKEW]
+    return max(past) if past else min(candidates)
+
+
+def read_lines(path):
+    """Yield the lines of a log file (gzip-compressed if it ends with .gz) without loading it whole"""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="UTF8", errors="replace") as file:
+        for line in file:
+            yield line.rstrip("\n")
+
+
+def follow(path, poll_interval=1.0, from_end=True, stop=None):
+    """
+    Yield lines appended to a log file, reopening it after rotation or truncation.
+    Yields None after every idle poll so callers can flush pending work. Runs until stop() is true.
+    """
+    file, inode, partial = None, None, b""
+    try:
+        while stop is None or not stop():
+            if file is None:
+                try:
+                    file = open(path, "rb")
+                except FileNotFoundError:
+                    time.sleep(poll_interval)
+                    yield None
+                    continue
+                inode = os.fstat(file.fileno()).st_ino
+                if from_end:
+                    file.seek(0, os.SEEK_END)
+                from_end = False  # A rotated file is read from its start
+
+            line = file.readline()
+            if line.endswith(b"\n"):
+                yield (partial + line).decode("UTF8", errors="replace").rstrip("\r\n")
+                partial = b""
+                continue
+            partial += line  # Incomplete last line - wait for the rest
+
+            try:
+                status = os.stat(path)
+                rotated = status.st_ino != inode or status.st_size < file.tell()
+            except FileNotFoundError:
+                rotated = True
+            if rotated:
+                file.close()
+                file, partial = None, b""
+            else:
+                time.sleep(poll_interval)
+            yield None
+    finally:
+        if file is not None:
+            file.close()
+
+
+class BruteForceDetector:
+    """
+    Count authentication failures per source address over a sliding time window and block offenders.
+    An address with threshold failures within window seconds becomes an IPHost (prefix + IPH_ + address)
+    in the brute-force group. Offenders are pushed with create_many in batches of up to batch_size,
+    at least every flush_interval seconds. Memory stays bounded: each address keeps at most threshold
+    timestamps and at most max_tracked addresses are tracked, least recently seen dropped first.
+    """
+
+    def __init__(self, firewall, threshold=5, window=300, max_tracked=100000, batch_size=100, flush_interval=10.0,
+                 prefix=PREFIX, group_name=GROUP_NAME, description=DESCRIPTION, patterns=FAILURE_PATTERNS, allowlist=()):
+        """
+        Configure the client, detection thresholds (failures per window in seconds), counter bounds,
+        batching and object naming. allowlist holds addresses or networks that are never blocked.
+        """
+        try:
+            threshold, max_tracked, batch_size = int(threshold), int(max_tracked), int(batch_size)
+            window, flush_interval = float(window), float(flush_interval)
+            if threshold < 1 or max_tracked < 1 or batch_size < 1 or window <= 0 or flush_interval < 0:
+                raise ValueError("Detector limits must be greater than 0")
+        except (TypeError, ValueError):
+            raise ValueError("threshold, window, max_tracked and batch_size must be valid numbers greater than 0")
+
+        self.firewall = firewall
+        self.threshold = threshold
+        self.window = window
+        self.max_tracked = max_tracked
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.prefix = prefix
+        self.group_name = group_name
+        self.description = description
+        self.patterns = [re.compile(pattern) for pattern in patterns]
+        self.allowlist = [ipaddress.ip_network(network, strict=False) for network in allowlist]
+
+        self.blocked = set()
+        self._failures = collections.OrderedDict()  # address -> deque of recent failure timestamps
+        self._pending = {}  # address -> IPHost payload
+        self._pending_since = None
+        self._last_timestamp = None  # Timestamp of the last line that had one
+        self._groups = set()
+        self.stats = {"lines": 0, "failures": 0, "offenders": 0, "evicted": 0, "pushed": 0, "errors": 0, "requests": 0}
+
+    # Detection
+    def process_line(self, line, live=False):
+        """
+        Count an authentication failure found in a log line. Returns the address if it just became an offender.
+        A line without a timestamp gets the current time when live (lines from follow), otherwise the
+        timestamp of the last failure line that had one, so reading an old file keeps its own clock.
+        """
+        self.stats["lines"] += 1
+        for pattern in self.patterns:
+            match = pattern.search(line)
+            if match:
+                timestamp = parse_timestamp(line, self._last_timestamp)
+                if timestamp is not None:
+                    self._last_timestamp = timestamp
+                elif live or self._last_timestamp is None:
+                    timestamp = time.time()
+                else:
+                    timestamp = self._last_timestamp
+                return self.observe(match.group("ip"), timestamp)
+        return None
+
+    def observe(self, address, timestamp):
+        """Record one failure from address at timestamp. Returns the address if it just became an offender"""
+        try:
+            address = ipaddress.ip_address(address)
+        except ValueError:
+            return None
+        if any(address in network for network in self.allowlist):
+            return None
+        self.stats["failures"] += 1
+
+        key = str(address)
+        if key in self.blocked or key in self._pending:
+            return None
+
+        failures = self._failures.get(key)
+        if failures is None:
+            failures = self._failures[key] = collections.deque(maxlen=self.threshold)
+            while len(self._failures) > self.max_tracked:
+                self._failures.popitem(last=False)
+                self.stats["evicted"] += 1
+        else:
+            self._failures.move_to_end(key)
+        failures.append(timestamp)
+
+        # The deque holds the last threshold failures; all within the window means an offender
+        if len(failures) == self.threshold and max(failures) - min(failures) <= self.window:
+            del self._failures[key]
+            self._queue(address)
+            self.stats["offenders"] += 1
+            return key
+        return None
+
+    # Blocking
+    def load_blocked(self):
+        """Mark addresses already blocked on the firewall (IPHosts named prefix + IPH_) so they are not pushed again"""
+        response = self.firewall.read_iter("IPHost", f"{self.prefix}{HOST_PREFIX}", LIKE)
+        if response["status"] == "216":
+            for record in response["data"]:
+                if record.get("HostType") == "IP" and str(record.get("Name", "")).startswith(self.prefix + HOST_PREFIX):
+                    self.blocked.add(str(ipaddress.ip_address(record["IPAddress"])))
+        return response["status"]
+
+    def due(self):
+        """Check whether pending offenders should be pushed now"""
+        if not self._pending:
+            return False
+        return len(self._pending) >= self.batch_size or time.monotonic() - self._pending_since >= self.flush_interval
+
+    def flush(self):
+        """
+        Push pending offenders with create_many, creating the group first if needed. Returns the batch
+        result, or None when nothing was pushed. Offenders of a family whose group could not be created
+        stay pending, as their hosts would refer to a missing group.
+        """
+        if not self._pending:
+            return None
+        pending, self._pending, self._pending_since = self._pending, {}, None
+
+        for family in sorted({payload["IPFamily"] for payload in pending.values()}):
+            if not self._ensure_group(family):
+                for address, payload in list(pending.items()):
+                    if payload["IPFamily"] == family:
+                        self._keep_pending(address, pending.pop(address))
+        if not pending:
+            return None
+
+        payloads = list(pending.values())
+        result = self.firewall.create_many("IPHost", payloads, self.batch_size)
+        self.stats["requests"] += -(-len(payloads) // self.batch_size)
+        names = {payload["Name"]: address for address, payload in pending.items()}
+        for item in result["data"]:
+            address = names.get(item["name"])
+            # 502: the object already exists, so the address is blocked already
+            if item["status"] in SUCCESS_CODES or item["status"] == "502":
+                self.blocked.add(address)
+                self.stats["pushed"] += 1
+            elif item["status"] in TRANSIENT_STATUSES:
+                self._keep_pending(address, pending[address])
+            else:
+                self.stats["errors"] += 1
+        return result
+
+    def run(self, lines, live=False):
+        """
+        Process lines (e.g. from read_lines, or from follow with live=True), pushing offenders whenever
+        a batch is due and once more at the end. A None line only gives the detector a chance to flush.
+        """
+        for line in lines:
+            if line is not None:
+                self.process_line(line, live)
+            if self.due():
+                self.flush()
+        self.flush()
+        return dict(self.stats)
+
+    # Helper methods
+    def _queue(self, address):
+        """Add an offender's IPHost payload to the pending batch"""
+        _, family = FAMILIES[address.version]
+        entity_data = {"Name": f"{self.prefix}{HOST_PREFIX}{address}", "IPFamily": family, "HostType": "IP", "IPAddress": str(address)}
+        group = self._group_name(address.version)
+        if group:
+            entity_data["HostGroupList"] = {"HostGroup": group}
+        if self.description:
+            entity_data["Description"] = self.description
+        if self._pending_since is None:
+            self._pending_since = time.monotonic()
+        self._pending[str(address)] = entity_data
+
+    def _keep_pending(self, address, entity_data):
+        """Keep an offender that could not be pushed for the next flush"""
+        if self._pending_since is None:
+            self._pending_since = time.monotonic()
+        self._pending[address] = entity_data
+
+    def _group_name(self, version):
+        """Group of an address family; IPv6 hosts use group_name + "_IPv6" as in ip_importer"""
+        if not self.group_name:
+            return None
+        return self.group_name if version == 4 else f"{self.group_name}_IPv6"
+
+    def _ensure_group(self, family):
+        """
+        Create the brute-force group of an address family once; an existing group (502) is fine.
+        Returns False if the group could not be created.
+        """
+        if not self.group_name or family in self._groups:
+            return True
+        group = {"Name": self._group_name(4 if family == "IPv4" else 6), "IPFamily": family}
+        if self.description:
+            group["Description"] = self.description
+        response = self.firewall.create("IPHostGroup", group)
+        self.stats["requests"] += 1
+        if response["status"] in SUCCESS_CODES or response["status"] == "502":
+            self._groups.add(family)
+            return True
+        self.stats["errors"] += 1
+        return False
+
+
+def main():
+    """Block brute-force sources found in authentication logs on one firewall from config.ini"""
+    parser = argparse.ArgumentParser(description="Block brute-force sources found in authentication logs")
+    parser.add_argument("config", help="config.ini with one section per firewall")
+    parser.add_argument("logs", nargs="+", help="Log files to read (.gz allowed)")
+    parser.add_argument("--section", help="config.ini section of the firewall (default: the first)")
+    parser.add_argument("--follow", action="store_true", help="Keep following the last log file for new lines")
+    parser.add_argument("--threshold", type=int, default=5, help="Failures that make an offender")
+    parser.add_argument("--window", type=float, default=300, help="Sliding window in seconds")
+    parser.add_argument("--batch-size", type=int, default=100, help="Offenders per create request")
+    parser.add_argument("--flush-interval", type=float, default=10, help="Seconds before a partial batch is pushed")
+    parser.add_argument("--allow", nargs="*", default=[], help="Addresses or networks never blocked")
+    args = parser.parse_args()
+
+    connections = load_connections(args.config)
+    if args.section:
+        connections = [connection for connection in connections if connection["name"] == args.section]
+    if not connections:
+        raise SystemExit(f"No firewall section found in {args.config}")
+
+    with Firewall(*(connections[0][field] for field in CONNECTION_FIELDS)) as firewall:
+        detector = BruteForceDetector(
+            firewall, args.threshold, args.window, batch_size=args.batch_size, flush_interval=args.flush_interval, allowlist=args.allow
+        )
+        detector.load_blocked()
+        for path in args.logs[:-1] if args.follow else args.logs:
+            detector.run(read_lines(path))
+        if args.follow:
+            try:
+                detector.run(follow(args.logs[-1], from_end=False), live=True)
+            except KeyboardInterrupt:
+                detector.flush()
+        print(detector.stats)
+
+
+if __name__ == "__main__":
+    main()
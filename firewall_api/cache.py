@@ -0,0 +1,120 @@
+# Standard library imports for caching
+import collections          # For the LRU ordered store
+import threading            # For safe use from several threads
+import time                 # For entry expiry
+
+# Local imports
+from .models import EntityModel
+
+# Entity types whose read results change when the key entity type is written.
+# Host objects carry their group membership, so writing one side changes the other.
+RELATED_ENTITIES = {
+    "IPHost": ("IPHostGroup",),
+    "IPHostGroup": ("IPHost",),
+    "FQDNHost": ("FQDNHostGroup",),
+    "FQDNHostGroup": ("FQDNHost",),
+    "Services": ("ServiceGroup",),
+    "ServiceGroup": ("Services",),
+}
+
+
+class ReadCache:
+    """
+    Response cache for Firewall.read with per-entry TTL and size-bounded LRU eviction.
+    Entries are keyed by firewall URL, entity, filter value, criteria and key field, and are
+    invalidated per entity type when the client writes that type.
+    """
+
+    def __init__(self, ttl=60, max_entries=256):
+        """Initialize the cache with entry lifetime in seconds and maximum number of entries"""
+        try:
+            ttl = float(ttl)
+            if ttl <= 0:
+                raise ValueError("TTL must be greater than 0")
+        except (TypeError, ValueError):
+            raise ValueError("ttl must be a valid number greater than 0")
+        try:
+            max_entries = int(max_entries)
+            if max_entries < 1:
+                raise ValueError("Cache size must be greater than 0")
+        except (TypeError, ValueError):
+            raise ValueError("max_entries must be a valid number greater than 0")
+
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+        self._entries = collections.OrderedDict()  # key -> (expires at, response)
+        self._entity_keys = collections.defaultdict(set)  # (scope, entity) -> keys
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0}
+
+    def get(self, key):
+        """Return a copy of the cached response for key, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            if entry[0] <= time.monotonic():
+                self._remove(key)
+                self._stats["expirations"] += 1
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return _copy(entry[1])
+
+    def put(self, key, response):
+        """Store a copy of a response, evicting the least recently used entries when full"""
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl, _copy(response))
+            self._entity_keys[key[:2]].add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self._stats["evictions"] += 1
+
+    def invalidate(self, scope, entity):
+        """Drop all entries for an entity type, and the types related to it, on one firewall"""
+        with self._lock:
+            for name in (entity,) + RELATED_ENTITIES.get(entity, ()):
+                for key in list(self._entity_keys.get((scope, name), ())):
+                    self._remove(key)
+                    self._stats["invalidations"] += 1
+
+    def clear(self):
+        """Drop all entries"""
+        with self._lock:
+            self._entries.clear()
+            self._entity_keys.clear()
+
+    def stats(self):
+        """Return hit/miss statistics and the current number of entries"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+    # Helper methods
+    def _remove(self, key):
+        """Remove an entry and its entity index reference (lock must be held)"""
+        del self._entries[key]
+        keys = self._entity_keys.get(key[:2])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._entity_keys[key[:2]]
+
+
+def _copy(value):
+    """Copy the dict/list structure of a response so callers cannot modify cached data"""
+    if isinstance(value, dict):
+        return {key: _copy(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy(item) for item in value]
+    if isinstance(value, EntityModel):
+        return value.copy()
+    return value
@@ -0,0 +1,314 @@
+# Standard library imports for the emulated API server
+import argparse             # For command line options
+import collections          # For ordered entity stores
+import datetime             # For certificate validity
+import http.server          # For the HTTP server
+import os                   # For temporary certificate files
+import ssl                  # For HTTPS
+import tempfile             # For temporary certificate files
+import threading            # For serving in the background and store locking
+import time                 # For emulated latency
+import urllib.parse         # For decoding the reqxml form field
+import xml.etree.ElementTree as ElementTree  # For request parsing and response building
+from xml.sax.saxutils import escape  # For escaping status messages
+
+# Local imports
+from .FirewallAPI import entity_key_field
+
+# Emulated API path, as used by Firewall.url
+API_PATH = "/webconsole/APIController"
+
+# Status codes and messages returned by the emulator
+STATUS_APPLIED = ("200", "Configuration applied successfully.")
+STATUS_EXISTS = ("502", "Operation failed. Entity having same name already exists.")
+STATUS_NOT_FOUND = ("541", "Operation failed. Entity not found.")
+STATUS_INVALID = ("529", "Input request file is invalid.")
+NO_RECORDS = "No. of records Zero."
+
+
+def generate_self_signed_cert(directory, hostname="localhost"):
+    """Write a self-signed certificate and key for hostname into directory, returning their paths"""
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.x509.oid import NameOID
+
+    key = ec.generate_private_key(ec.SECP256R1())
+    subject = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, hostname)])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    certificate = (
+        x509.CertificateBuilder()
+        .subject_name(subject)
+        .issuer_name(subject)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(days=1))
+        .not_valid_after(now + datetime.timedelta(days=30))
+        .add_extension(x509.SubjectAlternativeName([x509.DNSName(hostname)]), critical=False)
+        .sign(key, hashes.SHA256())
+    )
+
+    certfile = os.path.join(directory, "emulator.crt")
+    keyfile = os.path.join(directory, "emulator.key")
+    with open(certfile, "wb") as file:
+        file.write(certificate.public_bytes(serialization.Encoding.PEM))
+    with open(keyfile, "wb") as file:
+        file.write(
+            key.private_bytes(
+                serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+            )
+        )
+    return certfile, keyfile
+
+
+class FirewallEmulator:
+    """
+    Local stand-in for the Sophos XML API (/webconsole/APIController).
+    Keeps entities in memory and answers Get, Set (add/update) and Remove requests with the
+    same response shapes as the firewall, including Login failures, "No. of records Zero."
+    and per-entity Status codes. Intended for offline testing and benchmarking of the client.
+    """
+
+    def __init__(self, username="admin", password="admin", host="127.0.0.1", port=0, latency=0.0, use_tls=True, certfile=None, keyfile=None):
+        """
+        Configure the emulator. port=0 picks a free port; latency adds a delay in seconds to every request.
+        With use_tls and no certificate given, a temporary self-signed certificate is generated.
+        """
+        self.username = username
+        self.password = password
+        self.host = host
+        self.latency = float(latency)
+        self.use_tls = use_tls
+        self.certfile = certfile
+        self.keyfile = keyfile
+
+        self.stores = collections.defaultdict(collections.OrderedDict)  # entity -> name -> element
+        self.request_count = 0
+        self._lock = threading.Lock()
+        self._requested_port = int(port)
+        self._server = None
+        self._thread = None
+        self._tempdir = None
+
+    # Resource management methods
+    def __enter__(self):
+        """Context manager entry point - starts the server"""
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Context manager exit point - stops the server"""
+        self.stop()
+
+    def start(self):
+        """Start serving in a background thread"""
+        emulator = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length)
+                if self.path != API_PATH:
+                    self.send_error(404)
+                    return
+                response = emulator.handle(body).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/xml")
+                self.send_header("Content-Length", str(len(response)))
+                self.end_headers()
+                self.wfile.write(response)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = http.server.ThreadingHTTPServer((self.host, self._requested_port), Handler)
+        self._server.daemon_threads = True
+
+        if self.use_tls:
+            if not self.certfile:
+                self._tempdir = tempfile.TemporaryDirectory()
+                self.certfile, self.keyfile = generate_self_signed_cert(self._tempdir.name)
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(self.certfile, self.keyfile)
+            self._server.socket = context.wrap_socket(self._server.socket, server_side=True)
+
+        self._thread = threading.Thread(target=self._server.serve_forever, name="FirewallEmulator", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the server and remove temporary certificates"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._tempdir is not None:
+            self._tempdir.cleanup()
+            self._tempdir = None
+            self.certfile = self.keyfile = None
+
+    @property
+    def port(self):
+        """Port the server listens on"""
+        return self._server.server_address[1] if self._server is not None else self._requested_port
+
+    # Store management
+    def seed(self, entity, count, payload_size=0, prefix=None):
+        """Add count generated entities, each with a Description of payload_size characters"""
+        prefix = prefix if prefix is not None else f"{entity}_"
+        key_field = entity_key_field(entity)
+        with self._lock:
+            store = self.stores[entity]
+            start = len(store)
+            for number in range(start, start + count):
+                element = ElementTree.Element(entity)
+                ElementTree.SubElement(element, key_field).text = f"{prefix}{number}"
+                if entity == "IPHost":
+                    ElementTree.SubElement(element, "IPFamily").text = "IPv4"
+                    ElementTree.SubElement(element, "HostType").text = "IP"
+                    ElementTree.SubElement(element, "IPAddress").text = f"10.{number >> 16 & 255}.{number >> 8 & 255}.{number & 255}"
+                ElementTree.SubElement(element, "Description").text = "x" * payload_size
+                store[f"{prefix}{number}"] = element
+
+    def clear(self):
+        """Remove all stored entities"""
+        with self._lock:
+            self.stores.clear()
+
+    # Request handling
+    def handle(self, body):
+        """Handle a form-encoded API request body and return the XML response text"""
+        if self.latency:
+            time.sleep(self.latency)
+
+        with self._lock:
+            self.request_count += 1
+
+        try:
+            request_xml = urllib.parse.parse_qs(body.decode(), keep_blank_values=True)["reqxml"][0]
+            request = ElementTree.fromstring(request_xml)
+        except (KeyError, IndexError, UnicodeDecodeError, ElementTree.ParseError):
+            return self._response(self._status(*STATUS_INVALID))
+
+        login = request.find("Login")
+        if login is None or login.findtext("Username") != self.username or login.findtext("Password") != self.password:
+            return self._response("<Login><status>Authentication Failure</status></Login>", login=False)
+
+        fragments = []
+        with self._lock:
+            for action in request:
+                if action.tag == "Get":
+                    fragments.extend(self._get(entity) for entity in action)
+                elif action.tag == "Set" and action.get("operation", "add") in ("add", "update"):
+                    fragments.extend(self._set(entity, action.get("operation", "add")) for entity in action)
+                elif action.tag == "Remove":
+                    fragments.extend(self._remove(entity) for entity in action)
+                elif action.tag != "Login":
+                    fragments.append(self._status(*STATUS_INVALID))
+        return self._response("".join(fragments))
+
+    def _get(self, request):
+        """Return the stored entities matching an optional Filter"""
+        entity = request.tag
+        records = list(self.stores.get(entity, {}).values())
+        key = request.find("Filter/key")
+        if key is not None:
+            records = [record for record in records if self._matches(record, key)]
+        if not records:
+            return f"<{entity}><Status>{NO_RECORDS}</Status></{entity}>"
+        return "".join(self._entity_xml(record) for record in records)
+
+    def _set(self, element, operation):
+        """Add or update one entity, returning its per-entity Status"""
+        entity = element.tag
+        name = element.findtext(entity_key_field(entity))
+        store = self.stores[entity]
+        if operation == "add" and name in store:
+            return self._entity_status(entity, *STATUS_EXISTS)
+        if operation == "update" and name not in store:
+            return self._entity_status(entity, *STATUS_NOT_FOUND)
+        store[name] = element
+        return self._entity_status(entity, *STATUS_APPLIED)
+
+    def _remove(self, request):
+        """Remove entities by key elements or by Filter, returning per-entity Status"""
+        entity = request.tag
+        store = self.stores.get(entity, {})
+        key = request.find("Filter/key")
+        if key is not None:
+            names = [name for name, record in store.items() if self._matches(record, key)]
+            for name in names:
+                del store[name]
+            return self._entity_status(entity, *(STATUS_APPLIED if names else STATUS_NOT_FOUND))
+
+        statuses = []
+        for child in request.findall(entity_key_field(entity)):
+            if store.pop(child.text, None) is None:
+                statuses.append(self._entity_status(entity, *STATUS_NOT_FOUND))
+            else:
+                statuses.append(self._entity_status(entity, *STATUS_APPLIED))
+        return "".join(statuses) or self._entity_status(entity, *STATUS_NOT_FOUND)
+
+    # Helper methods
+    def _matches(self, record, key):
+        """Evaluate a Filter key against a stored entity"""
+        value = record.findtext(key.get("name", "Name")) or ""
+        expected = key.text or ""
+        criteria = key.get("criteria", "=")
+        if criteria == "=":
+            return value == expected
+        if criteria == "!=":
+            return value != expected
+        if criteria == "like":
+            return expected.lower() in value.lower()
+        return False
+
+    def _entity_xml(self, record):
+        """Serialize a stored entity with a transactionid attribute"""
+        record.set("transactionid", "")
+        return ElementTree.tostring(record, encoding="unicode")
+
+    def _entity_status(self, entity, code, message):
+        """Per-entity Status element"""
+        return f'<{entity} transactionid=""><Status code="{code}">{escape(message)}</Status></{entity}>'
+
+    def _status(self, code, message):
+        """Top-level Status element"""
+        return f'<Status code="{code}">{escape(message)}</Status>'
+
+    def _response(self, body, login=True):
+        """Wrap response fragments in the Response envelope"""
+        login_xml = "<Login><status>Authentication Successful</status></Login>" if login else ""
+        return f'<?xml version="1.0" encoding="UTF-8"?>\n<Response APIVersion="2000.1" IPS_CAT_VER="1">{login_xml}{body}</Response>'
+
+
+def main():
+    """Run the emulator from the command line"""
+    parser = argparse.ArgumentParser(description="Local emulator of the Sophos Firewall XML API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=4444)
+    parser.add_argument("--username", default="admin")
+    parser.add_argument("--password", default="admin")
+    parser.add_argument("--latency", type=float, default=0.0, help="Delay added to every request, in seconds")
+    parser.add_argument("--no-tls", action="store_true", help="Serve plain HTTP")
+    parser.add_argument("--seed", nargs=2, action="append", metavar=("ENTITY", "COUNT"), default=[])
+    parser.add_argument("--payload-size", type=int, default=0, help="Description length of seeded entities")
+    args = parser.parse_args()
+
+    emulator = FirewallEmulator(args.username, args.password, args.host, args.port, args.latency, not args.no_tls)
+    for entity, count in args.seed:
+        emulator.seed(entity, int(count), args.payload_size)
+    emulator.start()
+    print(f"Emulating {API_PATH} on {'https' if emulator.use_tls else 'http'}://{args.host}:{emulator.port}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        emulator.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+# Standard library imports for concurrent exports
+import argparse             # For command line options
+import gzip                 # For gzip-compressed blocks
+import json                 # For JSON Lines records, indexes and the export manifest
+import os                   # For output files
+import time                 # For per-entity timings
+from concurrent.futures import ThreadPoolExecutor
+
+# Third-party imports
+import requests             # For errors raised while streaming
+
+# Local imports
+from .FirewallAPI import Firewall
+from .fleet import CONNECTION_FIELDS, load_connections
+
+# Optional zstd support
+try:
+    import zstandard        # For zstd-compressed blocks
+except ImportError:
+    zstandard = None
+
+# Marker ending the entity list in Imports.csv
+END_MARKER = "### END ###"
+
+# File extension of each compression format
+EXTENSIONS = {"gzip": ".jsonl.gz", "zstd": ".jsonl.zst"}
+
+# Name of the export manifest written next to the entity files
+MANIFEST = "export.json"
+
+
+def load_entities(path):
+    """Read entity types from an Imports.csv-style file: one per line, stopping at '### END ###'"""
+    entities = []
+    with open(path, "r", encoding="UTF8") as file:
+        for line in file:
+            entity = line.strip().strip(",")
+            if entity == END_MARKER:
+                break
+            if entity and entity not in entities:
+                entities.append(entity)
+    return entities
+
+
+def compress(data, compression):
+    """Compress one block as a self-contained gzip member or zstd frame"""
+    if compression == "zstd":
+        return zstandard.ZstdCompressor().compress(data)
+    return gzip.compress(data, mtime=0)
+
+
+def decompress(data, compression):
+    """Decompress one block"""
+    if compression == "zstd":
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+class Exporter:
+    """
+    Export entity types from one firewall concurrently, streaming every record as one JSON line.
+    Records are compressed in blocks of block_size lines. Each block is an independent gzip member
+    (or zstd frame), so the file is still a normal .jsonl.gz/.jsonl.zst, and an offset index per
+    entity type lets ExportReader decompress only the block that holds a record.
+    """
+
+    def __init__(self, firewall, directory, compression="gzip", max_workers=4, block_size=256):
+        """Configure the client, output directory, compression ("gzip" or "zstd"), parallel reads and lines per block"""
+        if compression not in EXTENSIONS:
+            raise ValueError("compression must be 'gzip' or 'zstd'")
+        if compression == "zstd" and zstandard is None:
+            raise ValueError("zstd compression requires the 'zstandard' package")
+        try:
+            max_workers, block_size = int(max_workers), int(block_size)
+            if max_workers < 1 or block_size < 1:
+                raise ValueError("Workers and block size must be greater than 0")
+        except (TypeError, ValueError):
+            raise ValueError("max_workers and block_size must be valid numbers greater than 0")
+
+        self.firewall = firewall
+        self.directory = directory
+        self.compression = compression
+        self.max_workers = max_workers
+        self.block_size = block_size
+
+    def export(self, entities):
+        """
+        Export every entity type, max_workers at a time, over the client's session.
+        Returns {entity: {"status", "message", "count", "path", "elapsed"}}, also written to export.json.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        self.firewall.ensure_pool_size(self.max_workers)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="Exporter") as executor:
+            results = dict(zip(entities, executor.map(self.export_entity, entities)))
+
+        manifest = {"compression": self.compression, "exported": time.time(), "entities": results}
+        with open(os.path.join(self.directory, MANIFEST), "w", encoding="UTF8") as file:
+            json.dump(manifest, file, indent=4)
+        return results
+
+    def export_entity(self, entity):
+        """Stream one entity type to its compressed JSON Lines file and write its offset index"""
+        started = time.perf_counter()
+        path = os.path.join(self.directory, entity + EXTENSIONS[self.compression])
+        response = self.firewall.read_iter(entity)
+        if response["status"] not in ("216", "526"):
+            return self._result(response["status"], response["message"], 0, None, started)
+
+        blocks, names, lines = [], {}, []
+        temp_path = path + ".tmp"
+        try:
+            with open(temp_path, "wb") as file:
+                for record in response["data"]:
+                    name = record.get("Name", record.get("RuleName")) if isinstance(record, dict) else None
+                    if name is not None:
+                        names.setdefault(str(name), (len(blocks), len(lines)))
+                    lines.append(json.dumps(record, ensure_ascii=False))
+                    if len(lines) >= self.block_size:
+                        self._write_block(file, lines, blocks)
+                        lines = []
+                if lines:
+                    self._write_block(file, lines, blocks)
+        except requests.RequestException as e:
+            os.remove(temp_path)
+            error = self.firewall._request_error(e)
+            return self._result(error["status"], error["message"], 0, None, started)
+
+        count = sum(block[2] for block in blocks)
+        index = {"compression": self.compression, "count": count, "blocks": blocks, "names": names}
+        with open(self._index_path(entity), "w", encoding="UTF8") as file:
+            json.dump(index, file, separators=(",", ":"))
+        os.replace(temp_path, path)
+        return self._result(response["status"], response["message"], count, path, started)
+
+    # Helper methods
+    def _write_block(self, file, lines, blocks):
+        """Compress and append a block of lines, recording [offset, length, line count]"""
+        data = compress(("\n".join(lines) + "\n").encode(), self.compression)
+        blocks.append([file.tell(), len(data), len(lines)])
+        file.write(data)
+
+    def _index_path(self, entity):
+        """Path of an entity type's offset index"""
+        return os.path.join(self.directory, f"{entity}.index.json")
+
+    def _result(self, status, message, count, path, started):
+        """Per-entity export result"""
+        return {"status": status, "message": message, "count": count, "path": path, "elapsed": time.perf_counter() - started}
+
+
+class ExportReader:
+    """Look up records in a directory written by Exporter, decompressing only the blocks needed"""
+
+    def __init__(self, directory):
+        """Open an export directory"""
+        self.directory = directory
+        self._indexes = {}
+
+    def entities(self):
+        """Entity types exported successfully"""
+        with open(os.path.join(self.directory, MANIFEST), "r", encoding="UTF8") as file:
+            manifest = json.load(file)
+        return [entity for entity, result in manifest["entities"].items() if result["path"]]
+
+    def names(self, entity):
+        """Names of the records of an entity type, in export order"""
+        return list(self._index(entity)["names"])
+
+    def lookup(self, entity, name):
+        """Return the record with the given Name (or RuleName), or None"""
+        index = self._index(entity)
+        position = index["names"].get(name)
+        if position is None:
+            return None
+        block, line = position
+        return self._read_block(entity, index, block)[line]
+
+    def iter(self, entity):
+        """Yield every record of an entity type, one block in memory at a time"""
+        index = self._index(entity)
+        for block in range(len(index["blocks"])):
+            yield from self._read_block(entity, index, block)
+
+    # Helper methods
+    def _index(self, entity):
+        """Load and keep an entity type's offset index"""
+        index = self._indexes.get(entity)
+        if index is None:
+            with open(os.path.join(self.directory, f"{entity}.index.json"), "r", encoding="UTF8") as file:
+                index = self._indexes[entity] = json.load(file)
+        return index
+
+    def _read_block(self, entity, index, block):
+        """Decompress one block and parse its records"""
+        offset, length, _ = index["blocks"][block]
+        path = os.path.join(self.directory, entity + EXTENSIONS[index["compression"]])
+        with open(path, "rb") as file:
+            file.seek(offset)
+            data = decompress(file.read(length), index["compression"])
+        return [json.loads(line) for line in data.decode().splitlines()]
+
+
+def main():
+    """Export the entity types listed in an Imports.csv file from one firewall in config.ini"""
+    parser = argparse.ArgumentParser(description="Export firewall configuration to compressed JSON Lines")
+    parser.add_argument("config", help="config.ini with one section per firewall")
+    parser.add_argument("imports", help="Entity list, one per line, ending at '### END ###'")
+    parser.add_argument("output", help="Output directory")
+    parser.add_argument("--section", help="config.ini section of the firewall (default: the first)")
+    parser.add_argument("--compression", choices=sorted(EXTENSIONS), default="gzip")
+    parser.add_argument("--workers", type=int, default=4, help="Entity types read in parallel")
+    parser.add_argument("--block-size", type=int, default=256, help="Records per compressed block")
+    args = parser.parse_args()
+
+    connections = load_connections(args.config)
+    if args.section:
+        connections = [connection for connection in connections if connection["name"] == args.section]
+    if not connections:
+        raise SystemExit(f"No firewall section found in {args.config}")
+
+    with Firewall(*(connections[0][field] for field in CONNECTION_FIELDS)) as firewall:
+        exporter = Exporter(firewall, args.output, args.compression, args.workers, args.block_size)
+        for entity, result in exporter.export(load_entities(args.imports)).items():
+            print(f"{entity:<32} {result['status']:>4} {result['count']:>8} {result['elapsed']:>8.2f}s  {result['message']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+# Standard library imports for filter expressions
+import collections          # For planned reads
+import itertools            # For expanding AND of ORs
+
+# Filter comparison operators, as in FirewallAPI
+EQ = "="
+NOT = "!="
+LIKE = "like"
+
+# At most this many filtered reads are sent for one expression; above it the table is read once
+MAX_READS = 8
+
+# Fields naming an entity; keys on them are usually the most selective
+NAME_FIELDS = ("Name", "RuleName")
+
+# One read of a filter plan: the key sent to the firewall (None reads the whole table), the part of
+# the expression checked on the returned records (None keeps all) and the whole condition of the read
+PlannedRead = collections.namedtuple("PlannedRead", "key residual condition")
+
+
+class Condition:
+    """Base of filter expressions; combine them with & (and) and | (or)"""
+
+    def __and__(self, other):
+        return And(self, other)
+
+    def __or__(self, other):
+        return Or(self, other)
+
+    def matches(self, record):
+        """Check whether an entity record satisfies the condition"""
+        raise NotImplementedError
+
+    def fields(self):
+        """Field paths used by the condition, in order"""
+        raise NotImplementedError
+
+
+class Key(Condition):
+    """
+    One comparison of a field with a value, like a Filter key of the XML API.
+    field may be a dotted path (e.g. "ServiceDetails.ServiceDetail.Protocol"); such keys are only
+    checked on the returned records. LIKE is a case-insensitive substring match. A list matches EQ
+    and LIKE when one of its values does, and NOT when none does. A missing field compares as "".
+    """
+
+    def __init__(self, field, value, criteria=EQ):
+        """Create a comparison of field with value using EQ, NOT or LIKE"""
+        if criteria not in (EQ, NOT, LIKE):
+            raise ValueError("criteria must be EQ, NOT or LIKE")
+        self.field = field
+        self.value = str(value)
+        self.criteria = criteria
+
+    def matches(self, record):
+        """Check whether an entity record satisfies the comparison"""
+        values = field_values(record, self.field)
+        if not values:
+            values = [""]
+        if self.criteria == LIKE:
+            expected = self.value.lower()
+            return any(expected in value.lower() for value in values)
+        found = self.value in values
+        return found if self.criteria == EQ else not found
+
+    def fields(self):
+        """Field paths used by the comparison"""
+        return [self.field]
+
+    def pushable(self):
+        """Check whether the firewall can evaluate the comparison as a Filter key"""
+        return "." not in self.field and self.value != ""
+
+    def __eq__(self, other):
+        if not isinstance(other, Key):
+            return NotImplemented
+        return (self.field, self.value, self.criteria) == (other.field, other.value, other.criteria)
+
+    def __hash__(self):
+        return hash((self.field, self.value, self.criteria))
+
+    def __repr__(self):
+        return f"Key({self.field!r}, {self.value!r}, {self.criteria!r})"
+
+
+class And(Condition):
+    """Conditions that must all be satisfied"""
+
+    def __init__(self, *terms):
+        """Combine terms (Key, And or Or)"""
+        if not terms:
+            raise ValueError("And needs at least one condition")
+        self.terms = terms
+
+    def matches(self, record):
+        """Check whether an entity record satisfies every term"""
+        return all(term.matches(record) for term in self.terms)
+
+    def fields(self):
+        """Field paths used by the terms"""
+        return _unique(field for term in self.terms for field in term.fields())
+
+    def __repr__(self):
+        return f"And({', '.join(map(repr, self.terms))})"
+
+
+class Or(Condition):
+    """Conditions of which at least one must be satisfied"""
+
+    def __init__(self, *terms):
+        """Combine terms (Key, And or Or)"""
+        if not terms:
+            raise ValueError("Or needs at least one condition")
+        self.terms = terms
+
+    def matches(self, record):
+        """Check whether an entity record satisfies any term"""
+        return any(term.matches(record) for term in self.terms)
+
+    def fields(self):
+        """Field paths used by the terms"""
+        return _unique(field for term in self.terms for field in term.fields())
+
+    def __repr__(self):
+        return f"Or({', '.join(map(repr, self.terms))})"
+
+
+def plan(expression, max_reads=MAX_READS):
+    """
+    Split a filter expression into reads. The expression is expanded to an OR of ANDs of keys; each
+    AND sends its most selective pushable key to the firewall (see _selectivity) and the remaining keys
+    are checked on the returned records. ANDs sending the same key share one read. When an AND has no
+    pushable key, or more than max_reads reads would be needed, the whole table is read once and filtered.
+    """
+    disjuncts = _expand(expression, max_reads)
+    if disjuncts is None:
+        return [PlannedRead(None, expression, expression)]
+
+    # An AND whose keys imply every key of another AND selects nothing the other does not
+    disjuncts = [
+        keys for index, keys in enumerate(disjuncts)
+        if not any(
+            _covers(other, keys) and (not _covers(keys, other) or position < index)
+            for position, other in enumerate(disjuncts) if position != index
+        )
+    ]
+
+    residuals = {}  # Pushed key -> residual conditions of the ANDs sending it (None keeps every record)
+    for keys in disjuncts:
+        pushable = [key for key in keys if key.pushable()]
+        if not pushable:
+            return [PlannedRead(None, expression, expression)]
+        pushed = min(pushable, key=_selectivity)
+        remaining = sorted(keys - {pushed}, key=repr)
+        residuals.setdefault(pushed, []).append(And(*remaining) if remaining else None)
+
+    reads = []
+    for pushed, conditions in residuals.items():
+        if None in conditions:
+            residual = None
+        else:
+            residual = conditions[0] if len(conditions) == 1 else Or(*conditions)
+        reads.append(PlannedRead(pushed, residual, pushed if residual is None else And(pushed, residual)))
+    return reads
+
+
+def field_values(record, path):
+    """String values at a dotted field path of a record, looking through lists"""
+    return _values(record, path.split("."))
+
+
+# Helper functions
+def _expand(expression, limit):
+    """Expand an expression to a list of frozensets of keys (OR of ANDs), or None above limit ANDs"""
+    if isinstance(expression, Key):
+        return [frozenset((expression,))]
+    expanded = []
+    for term in expression.terms:
+        terms = _expand(term, limit)
+        if terms is None:
+            return None
+        expanded.append(terms)
+    if isinstance(expression, Or):
+        result = [keys for terms in expanded for keys in terms]
+    else:
+        count = 1
+        for terms in expanded:
+            count *= len(terms)
+        if count > limit:
+            return None
+        result = [frozenset().union(*combination) for combination in itertools.product(*expanded)]
+    return result if len(result) <= limit else None
+
+
+def _selectivity(key):
+    """Sort key ranking Filter keys: EQ and LIKE on the name field first, then other EQ, LIKE and NOT keys"""
+    rank = (EQ, LIKE, NOT).index(key.criteria)
+    if key.field in NAME_FIELDS and key.criteria != NOT:
+        rank -= 3
+    return rank, key.field, key.value
+
+
+def _covers(general, specific):
+    """Check whether every record matching all keys of specific matches all keys of general"""
+    return all(any(_implies(key, other) for key in specific) for other in general)
+
+
+def _implies(key, other):
+    """Check whether every record matching key matches other"""
+    if key == other:
+        return True
+    return (
+        key.field == other.field and other.criteria == LIKE and key.criteria in (EQ, LIKE)
+        and other.value.lower() in key.value.lower()
+    )
+
+
+def _values(value, keys):
+    """String values found at a field path, looking through lists"""
+    if isinstance(value, list):
+        return [found for item in value for found in _values(item, keys)]
+    if not keys:
+        if hasattr(value, "get"):
+            value = value.get("#text")  # Element with attributes
+        return [value] if isinstance(value, str) else []
+    if not hasattr(value, "get"):
+        return []
+    return _values(value.get(keys[0]), keys[1:])
+
+
+def _unique(fields):
+    """Fields without repeats, in order"""
+    return list(dict.fromkeys(fields))
@@ -0,0 +1,192 @@
+# Standard library imports for parallel execution
+import collections          # For per-host job queues
+import configparser         # For reading connection definitions from config.ini
+import time                 # For per-host and per-job timings
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+# Local imports
+from .FirewallAPI import POOL_MAXSIZE, Firewall
+
+# Connection fields accepted from connection definitions, in Firewall constructor order
+CONNECTION_FIELDS = ("username", "password", "hostname", "port", "certificate_verify", "timeout")
+
+
+def load_connections(config_path):
+    """
+    Load connection definitions from a config.ini file with one section per firewall.
+    Each section uses the same keys as the notebooks: username, password, firewall_ip,
+    port, certificate_verify and timeout.
+    """
+    config = configparser.ConfigParser(interpolation=None)
+    if not config.read(config_path):
+        raise ValueError(f"Unable to read configuration file: {config_path}")
+
+    connections = []
+    for section in config.sections():
+        settings = config[section]
+        connections.append(
+            {
+                "name": section,
+                "username": settings.get("username"),
+                "password": settings.get("password"),
+                "hostname": settings.get("firewall_ip", settings.get("hostname")),
+                "port": settings.getint("port", fallback=4444),
+                "certificate_verify": settings.getboolean("certificate_verify", fallback=False),
+                "timeout": settings.getint("timeout", fallback=30),
+            }
+        )
+    return connections
+
+
+class FirewallFleet:
+    """
+    Run the same operation across many firewalls on a shared worker pool.
+    Results are yielded per host as soon as that host finishes.
+    """
+
+    def __init__(self, connections, max_workers=8, per_host_limit=1, retry_policy=None):
+        """
+        Store connection definitions and concurrency limits.
+        connections is a list of dicts with Firewall constructor arguments and an optional "name".
+        max_workers limits requests in flight across the fleet, per_host_limit limits them per firewall.
+        An optional RetryPolicy is applied to every firewall.
+        """
+        try:
+            max_workers = int(max_workers)
+            per_host_limit = int(per_host_limit)
+            if max_workers < 1 or per_host_limit < 1:
+                raise ValueError("Concurrency limits must be greater than 0")
+        except (TypeError, ValueError):
+            raise ValueError("max_workers and per_host_limit must be valid numbers greater than 0")
+
+        self.connections = []
+        for connection in connections:
+            if not isinstance(connection, dict) or not connection.get("hostname"):
+                raise ValueError("Each connection must be a dictionary with at least a 'hostname' field")
+            connection = dict(connection)
+            connection.setdefault("name", connection["hostname"])
+            self.connections.append(connection)
+
+        names = [connection["name"] for connection in self.connections]
+        if len(set(names)) != len(names):
+            raise ValueError("Connection names must be unique")
+
+        self.max_workers = max_workers
+        self.per_host_limit = per_host_limit
+        self.retry_policy = retry_policy
+
+    def run(self, task):
+        """
+        Run a task on every firewall and yield one result per host as each host finishes.
+        task is either a callable taking a Firewall, or a read plan: a list of entity names
+        or of dicts with Firewall.read keyword arguments (at least "entity").
+        """
+        jobs = self._build_jobs(task)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="FirewallFleet") as executor:
+            hosts = {}
+            futures = {}
+
+            for connection in self.connections:
+                name = connection["name"]
+                try:
+                    settings = {field: connection[field] for field in CONNECTION_FIELDS if field in connection}
+                    firewall = Firewall(**settings, retry_policy=self.retry_policy, pool_maxsize=max(self.per_host_limit, POOL_MAXSIZE))
+                except (TypeError, ValueError) as e:
+                    yield self._host_result(name, "400", f"Invalid connection settings: {e}", None, 0.0, {})
+                    continue
+
+                hosts[name] = {
+                    "firewall": firewall,
+                    "queue": collections.deque(jobs),
+                    "running": 0,
+                    "results": {},
+                    "timings": {},
+                    "errors": {},
+                    "started": time.perf_counter(),
+                }
+                for _ in range(min(self.per_host_limit, len(jobs))):
+                    self._submit(executor, futures, name, hosts[name])
+
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name, key = futures.pop(future)
+                    host = hosts[name]
+                    host["running"] -= 1
+                    result, elapsed, error = future.result()
+                    host["results"][key], host["timings"][key] = result, elapsed
+                    if error:
+                        host["errors"][key] = error
+
+                    if host["queue"]:
+                        self._submit(executor, futures, name, host)
+                    elif not host["running"]:
+                        yield self._finish_host(name, hosts.pop(name), callable(task))
+
+    # Helper methods
+    def _build_jobs(self, task):
+        """Turn a task into a list of (key, callable) jobs run against one firewall"""
+        if callable(task):
+            return [(None, task)]
+
+        if isinstance(task, (str, dict)) or not task:
+            raise ValueError("task must be a callable or a non-empty list of entity reads")
+
+        jobs = []
+        for step in task:
+            read_kwargs = {"entity": step} if isinstance(step, str) else dict(step)
+            if not read_kwargs.get("entity"):
+                raise ValueError("Each read plan entry must name an entity")
+            key = read_kwargs["entity"] if isinstance(step, str) else step.get("key", read_kwargs["entity"])
+            read_kwargs.pop("key", None)
+            jobs.append((key, lambda firewall, read_kwargs=read_kwargs: firewall.read(**read_kwargs)))
+
+        keys = [key for key, _ in jobs]
+        if len(set(keys)) != len(keys):
+            raise ValueError("Read plan entries must be unique; add a 'key' to repeated entities")
+        return jobs
+
+    def _submit(self, executor, futures, name, host):
+        """Submit the next queued job of a host"""
+        key, job = host["queue"].popleft()
+        host["running"] += 1
+        futures[executor.submit(self._run_job, host["firewall"], job)] = (name, key)
+
+    def _run_job(self, firewall, job):
+        """Run one job, returning (result, elapsed seconds, error message)"""
+        started = time.perf_counter()
+        try:
+            return job(firewall), time.perf_counter() - started, None
+        except Exception as e:
+            return None, time.perf_counter() - started, f"Task failed: {e}"
+
+    def _finish_host(self, name, host, single_task):
+        """Close the host connection and build its result"""
+        host["firewall"].close()
+        elapsed = time.perf_counter() - host["started"]
+
+        if single_task:
+            if None in host["errors"]:
+                return self._host_result(name, "500", host["errors"][None], None, elapsed, host["timings"])
+            return self._host_result(name, "216", "Task completed successfully.", host["results"][None], elapsed, host["timings"])
+
+        failed = [
+            key for key, result in host["results"].items()
+            if key in host["errors"] or result.get("status") not in ("216", "526")
+        ]
+        if failed:
+            message = f"Read failed for {len(failed)} of {len(host['results'])} entities: {', '.join(failed)}"
+            return self._host_result(name, "207", message, host["results"], elapsed, host["timings"])
+        return self._host_result(name, "216", "Operation completed successfully.", host["results"], elapsed, host["timings"])
+
+    def _host_result(self, name, status, message, data, elapsed, timings):
+        """Build a per-host result entry"""
+        return {
+            "host": name,
+            "status": status,
+            "message": message,
+            "data": data,
+            "elapsed": elapsed,
+            "timings": timings,
+        }
@@ -0,0 +1,157 @@
+# Standard library imports for address handling
+import ipaddress            # For parsing and summarizing IPv4/IPv6 addresses
+
+# Object naming prefixes used by the import notebooks
+HOST_PREFIX = "IPH_"        # Single address
+NETWORK_PREFIX = "IPNW_"    # CIDR network
+RANGE_PREFIX = "IPR_"       # Address range
+
+# Address family settings: (bits, IPFamily value)
+FAMILIES = {4: (32, "IPv4"), 6: (128, "IPv6")}
+
+
+def parse_address(spec):
+    """
+    Parse an address, CIDR network or "start-end" range into (version, first, last) integers.
+    Host bits set in a CIDR are ignored, e.g. "10.0.0.1/24" covers 10.0.0.0/24.
+    Raises ValueError for anything else.
+    """
+    spec = spec.replace(" ", "").strip()
+    if "-" in spec:
+        start, end = (ipaddress.ip_address(part) for part in spec.split("-", 1))
+        if start.version != end.version:
+            raise ValueError(f"Range mixes IPv4 and IPv6 addresses: {spec}")
+        if int(start) > int(end):
+            raise ValueError(f"Range start is after range end: {spec}")
+        return start.version, int(start), int(end)
+
+    if "/" in spec:
+        network = ipaddress.ip_network(spec, strict=False)
+        return network.version, int(network.network_address), int(network.broadcast_address)
+
+    address = ipaddress.ip_address(spec)
+    return address.version, int(address), int(address)
+
+
+def parse_addresses(specs):
+    """
+    Parse many address specs, skipping blank lines and "#" comments.
+    Returns ({version: [(first, last), ...]}, [(spec, error message), ...]).
+    """
+    intervals = {4: [], 6: []}
+    errors = []
+    for spec in specs:
+        spec = spec.split("#", 1)[0].strip()
+        if not spec:
+            continue
+        try:
+            version, first, last = parse_address(spec)
+        except ValueError as e:
+            errors.append((spec, str(e)))
+            continue
+        intervals[version].append((first, last))
+    return intervals, errors
+
+
+def load_addresses(path):
+    """Read address specs from a text file with one address, network or range per line"""
+    with open(path, mode="r", encoding="UTF8") as file:
+        return parse_addresses(file)
+
+
+def aggregate(intervals):
+    """Merge overlapping and adjacent (first, last) intervals into the minimal sorted list"""
+    merged = []
+    for first, last in sorted(intervals):
+        if merged and first <= merged[-1][1] + 1:
+            if last > merged[-1][1]:
+                merged[-1][1] = last
+        else:
+            merged.append([first, last])
+    return [(first, last) for first, last in merged]
+
+
+def to_objects(version, intervals, use_ranges=True):
+    """
+    Convert merged intervals into address objects as (host type, address, value) tuples.
+    An interval that is exactly one CIDR block becomes an IP or Network; any other interval
+    becomes one IPRange, or its minimal list of networks when use_ranges is False.
+    """
+    bits, _ = FAMILIES[version]
+    address_class = ipaddress.IPv4Address if version == 4 else ipaddress.IPv6Address
+
+    objects = []
+    for first, last in intervals:
+        size = last - first + 1
+        if size & (size - 1) == 0 and first % size == 0:
+            blocks = [(first, size)]
+        elif use_ranges:
+            objects.append(("IPRange", address_class(first), address_class(last)))
+            continue
+        else:
+            blocks = [
+                (int(network.network_address), network.num_addresses)
+                for network in ipaddress.summarize_address_range(address_class(first), address_class(last))
+            ]
+
+        for block_first, block_size in blocks:
+            if block_size == 1:
+                objects.append(("IP", address_class(block_first), None))
+            else:
+                prefix_length = bits - block_size.bit_length() + 1
+                objects.append(("Network", address_class(block_first), prefix_length))
+    return objects
+
+
+def build_payloads(specs, prefix="", group_name=None, description=None, use_ranges=True):
+    """
+    Build the IPHost (and IPHostGroup) payloads for a list of address specs.
+    Addresses are aggregated per family into the fewest objects, named like the import notebooks
+    (prefix + IPH_/IPNW_/IPR_ + address). With group_name, every host joins that group; IPv6 hosts
+    join group_name + "_IPv6" since a group holds one address family.
+    Returns {"IPHostGroup": [...], "IPHost": [...], "errors": [(spec, message), ...]}.
+    """
+    intervals, errors = parse_addresses(specs)
+    payloads = {"IPHostGroup": [], "IPHost": [], "errors": errors}
+
+    for version, family_intervals in intervals.items():
+        if not family_intervals:
+            continue
+        _, family = FAMILIES[version]
+        family_group = None
+        if group_name:
+            family_group = group_name if version == 4 else f"{group_name}_IPv6"
+            group = {"Name": family_group, "IPFamily": family}
+            if description:
+                group["Description"] = description
+            payloads["IPHostGroup"].append(group)
+
+        for host_type, address, value in to_objects(version, aggregate(family_intervals), use_ranges):
+            if host_type == "IP":
+                entity_data = {"Name": f"{prefix}{HOST_PREFIX}{address}", "IPFamily": family, "HostType": "IP", "IPAddress": str(address)}
+            elif host_type == "Network":
+                # IPv4 subnets are given as a netmask, IPv6 subnets as a prefix length
+                subnet = str(ipaddress.ip_network(f"{address}/{value}").netmask) if version == 4 else str(value)
+                entity_data = {
+                    "Name": f"{prefix}{NETWORK_PREFIX}{address}/{value}",
+                    "IPFamily": family,
+                    "HostType": "Network",
+                    "IPAddress": str(address),
+                    "Subnet": subnet,
+                }
+            else:
+                entity_data = {
+                    "Name": f"{prefix}{RANGE_PREFIX}{address}-{value}",
+                    "IPFamily": family,
+                    "HostType": "IPRange",
+                    "StartIPAddress": str(address),
+                    "EndIPAddress": str(value),
+                }
+
+            if family_group:
+                entity_data["HostGroupList"] = {"HostGroup": family_group}
+            if description:
+                entity_data["Description"] = description
+            payloads["IPHost"].append(entity_data)
+
+    return payloads
@@ -0,0 +1,184 @@
+# Standard library imports for indexing
+import ipaddress            # For subnet parsing
+import random               # For treap node priorities
+
+# Local imports
+from .ip_importer import parse_address
+
+
+class _Node:
+    """Treap node holding one address interval, ordered by (start, end, name)"""
+
+    __slots__ = ("key", "end", "priority", "left", "right", "max_end")
+
+    def __init__(self, key):
+        self.key = key
+        self.end = key[1]
+        self.priority = random.random()
+        self.left = None
+        self.right = None
+        self.max_end = key[1]
+
+
+def _update(node):
+    """Recompute the largest interval end in a subtree"""
+    max_end = node.end
+    if node.left is not None and node.left.max_end > max_end:
+        max_end = node.left.max_end
+    if node.right is not None and node.right.max_end > max_end:
+        max_end = node.right.max_end
+    node.max_end = max_end
+
+
+def _split(node, key):
+    """Split a subtree into nodes ordered before key and nodes at or after key"""
+    if node is None:
+        return None, None
+    if node.key < key:
+        node.right, right = _split(node.right, key)
+        _update(node)
+        return node, right
+    left, node.left = _split(node.left, key)
+    _update(node)
+    return left, node
+
+
+def _merge(left, right):
+    """Merge two subtrees where every key of left is ordered before every key of right"""
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        _update(left)
+        return left
+    right.left = _merge(left, right.left)
+    _update(right)
+    return right
+
+
+def _insert(root, node):
+    """Insert a node into a subtree"""
+    left, right = _split(root, node.key)
+    return _merge(_merge(left, node), right)
+
+
+def _delete(node, key):
+    """Delete the node with key from a subtree"""
+    if node is None:
+        return None
+    if key == node.key:
+        return _merge(node.left, node.right)
+    if key < node.key:
+        node.left = _delete(node.left, key)
+    else:
+        node.right = _delete(node.right, key)
+    _update(node)
+    return node
+
+
+def _covering(node, first, last, found):
+    """Collect intervals with start <= first and end >= last, skipping subtrees that cannot match"""
+    while node is not None and node.max_end >= last:
+        _covering(node.left, first, last, found)
+        if node.key[0] > first:
+            return  # This node and its right subtree start after first
+        if node.end >= last:
+            found.append(node.key)
+        node = node.right
+
+
+def _any_covering(node, first, last):
+    """Return True if any interval has start <= first and end >= last, in O(log n)"""
+    while node is not None:
+        if node.key[0] <= first:
+            # The whole left subtree starts before first as well
+            if node.end >= last or (node.left is not None and node.left.max_end >= last):
+                return True
+            node = node.right
+        else:
+            node = node.left
+    return False
+
+
+def host_intervals(record):
+    """
+    Return the (version, first, last) address intervals of an IPHost record.
+    Handles the IP, Network, IPRange and IPList host types; other records yield nothing.
+    """
+    host_type = record.get("HostType")
+    try:
+        if host_type == "IP":
+            return [parse_address(record["IPAddress"])]
+        if host_type == "Network":
+            network = ipaddress.ip_network(f"{record['IPAddress']}/{record['Subnet']}", strict=False)
+            return [(network.version, int(network.network_address), int(network.broadcast_address))]
+        if host_type == "IPRange":
+            return [parse_address(f"{record['StartIPAddress']}-{record['EndIPAddress']}")]
+        if host_type == "IPList":
+            addresses = record.get("ListOfIPAddresses") or ""
+            return [parse_address(address) for address in addresses.split(",") if address.strip()]
+    except (KeyError, TypeError, ValueError):
+        pass
+    return []
+
+
+class IPHostIndex:
+    """
+    In-memory interval index over IPHost objects.
+    Answers "which objects cover this address, network or range?" in logarithmic time and
+    supports adding and removing objects as they change on the firewall.
+    """
+
+    def __init__(self, records=()):
+        """Build the index from Firewall.read("IPHost") data"""
+        self._roots = {4: None, 6: None}
+        self._keys = {}  # name -> list of (version, key)
+        for record in records:
+            self.add(record)
+
+    def __len__(self):
+        """Number of indexed objects"""
+        return len(self._keys)
+
+    def __contains__(self, name):
+        """Check whether an object name is indexed"""
+        return name in self._keys
+
+    def add(self, record):
+        """Index an IPHost record, replacing any object with the same name. Returns False if it has no addresses"""
+        name = record.get("Name")
+        intervals = host_intervals(record)
+        if name is None or not intervals:
+            return False
+
+        self.remove(name)
+        keys = []
+        for version, first, last in intervals:
+            key = (first, last, name)
+            self._roots[version] = _insert(self._roots[version], _Node(key))
+            keys.append((version, key))
+        self._keys[name] = keys
+        return True
+
+    def remove(self, name):
+        """Remove an object from the index. Returns False if it was not indexed"""
+        keys = self._keys.pop(name, None)
+        if keys is None:
+            return False
+        for version, key in keys:
+            self._roots[version] = _delete(self._roots[version], key)
+        return True
+
+    def covers(self, spec):
+        """Return True if one indexed object fully covers an address, CIDR network or range"""
+        version, first, last = parse_address(spec)
+        return _any_covering(self._roots[version], first, last)
+
+    def covering(self, spec):
+        """Return the names of all indexed objects that fully cover an address, CIDR network or range"""
+        version, first, last = parse_address(spec)
+        found = []
+        _covering(self._roots[version], first, last, found)
+        return sorted({name for _, _, name in found})
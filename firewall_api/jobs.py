@@ -0,0 +1,157 @@
+# Standard library imports for resumable jobs
+import hashlib              # For payload digests
+import json                 # For journal lines
+import os                   # For durable journal writes
+import threading            # For appending from several threads
+
+# Local imports
+from .FirewallAPI import BATCH_SIZE, SUCCESS_CODES
+from .models import EntityModel
+from .snapshot import encode
+
+# Per-item status of work skipped because the journal records it as done
+SKIPPED = ("208", "Already completed in an earlier run.")
+
+# Create statuses meaning the object exists on the firewall, so the item is done
+EXISTS_STATUSES = ("502",)
+
+
+def digest(entity_data):
+    """Short digest of a payload, so a changed payload is not mistaken for finished work"""
+    if isinstance(entity_data, EntityModel):
+        entity_data = entity_data.to_dict()
+    return hashlib.blake2b(encode(entity_data), digest_size=8).hexdigest()
+
+
+class JobRunner:
+    """
+    Run bulk creates, updates and deletes through the batch methods of a Firewall, recording every
+    finished item in an append-only journal (one short JSON line per item: operation, entity type,
+    name and payload digest). Running the same job again skips the items the journal lists, without
+    reading anything back from the firewall, so an interrupted import resumes where it stopped.
+    A create answered with "already exists" counts as done, which covers items sent just before a crash.
+    """
+
+    def __init__(self, firewall, journal_path, batch_size=BATCH_SIZE, fsync=True):
+        """Configure the client, journal file, items per request and whether journal writes are synced to disk"""
+        try:
+            batch_size = int(batch_size)
+            if batch_size < 1:
+                raise ValueError("Batch size must be greater than 0")
+        except (TypeError, ValueError):
+            raise ValueError("batch_size must be a valid number greater than 0")
+
+        self.firewall = firewall
+        self.journal_path = journal_path
+        self.batch_size = batch_size
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._done = self._load()
+
+    def create(self, entity, items):
+        """Create the entities not created yet by an earlier run"""
+        return self._run("create", entity, list(items), lambda chunk: self.firewall.create_many(entity, chunk, self.batch_size))
+
+    def update(self, entity, items, entity_name_key="Name"):
+        """Apply the updates not applied yet by an earlier run"""
+        return self._run(
+            "update", entity, list(items),
+            lambda chunk: self.firewall.update_many(entity, chunk, entity_name_key, self.batch_size),
+            entity_name_key,
+        )
+
+    def delete(self, entity, names):
+        """Delete the entities not deleted yet by an earlier run"""
+        return self._run("delete", entity, list(names), lambda chunk: self.firewall.delete_many(entity, chunk, self.batch_size))
+
+    def is_done(self, operation, entity, item, entity_name_key="Name"):
+        """Check whether the journal records an item (payload, or name for deletes) as done"""
+        return self._entry(operation, entity, item, entity_name_key) in self._done
+
+    def completed(self):
+        """Number of finished items in the journal"""
+        return len(self._done)
+
+    def reset(self):
+        """Forget all finished work and remove the journal"""
+        with self._lock:
+            self._done = set()
+            if os.path.exists(self.journal_path):
+                os.remove(self.journal_path)
+
+    # Helper methods
+    def _run(self, operation, entity, items, send, entity_name_key="Name"):
+        """Send the unfinished items in batches, journaling each batch's finished items before the next"""
+        results = [None] * len(items)
+        pending = []
+        for index, item in enumerate(items):
+            entry = self._entry(operation, entity, item, entity_name_key)
+            if entry in self._done:
+                results[index] = {"name": entry[2], "status": SKIPPED[0], "message": SKIPPED[1]}
+            else:
+                pending.append((index, item, entry))
+
+        for start in range(0, len(pending), self.batch_size):
+            chunk = pending[start:start + self.batch_size]
+            response = send([item for _, item, _ in chunk])
+            finished = []
+            for (index, _, entry), result in zip(chunk, response["data"]):
+                results[index] = result
+                if result["status"] in SUCCESS_CODES or (operation == "create" and result["status"] in EXISTS_STATUSES):
+                    finished.append(entry)
+            self._append(finished)
+
+        failed = sum(1 for result in results if result["status"] not in SUCCESS_CODES + (SKIPPED[0],) + EXISTS_STATUSES)
+        skipped = sum(1 for result in results if result["status"] == SKIPPED[0])
+        if not failed:
+            return {
+                "status": "216",
+                "message": f"Operation completed successfully for {len(results)} entities ({skipped} already done).",
+                "data": results,
+            }
+        return {
+            "status": "207",
+            "message": f"Operation failed for {failed} of {len(results)} entities.",
+            "data": results,
+        }
+
+    def _entry(self, operation, entity, item, entity_name_key):
+        """Journal entry of an item: (operation, entity, name, payload digest or None for deletes)"""
+        if operation == "delete":
+            return (operation, entity, str(item), None)
+        if not hasattr(item, "get"):
+            return (operation, entity, None, None)  # Rejected by the batch method, never journaled
+        name = item.get(entity_name_key) if operation == "update" else item.get("Name", item.get("RuleName"))
+        return (operation, entity, None if name is None else str(name), digest(item))
+
+    def _append(self, entries):
+        """Append finished entries to the journal and make them durable"""
+        if not entries:
+            return
+        lines = "".join(json.dumps(list(entry), ensure_ascii=False, separators=(",", ":")) + "\n" for entry in entries)
+        with self._lock:
+            with open(self.journal_path, "a", encoding="UTF8") as file:
+                file.write(lines)
+                file.flush()
+                if self.fsync:
+                    os.fsync(file.fileno())
+            self._done.update(entries)
+
+    def _load(self):
+        """Read the finished entries from the journal, dropping a last line cut short by a crash"""
+        done = set()
+        if not os.path.exists(self.journal_path):
+            return done
+        with open(self.journal_path, "rb+") as file:
+            data = file.read()
+            if data and not data.endswith(b"\n"):
+                data = data[:data.rfind(b"\n") + 1]
+                file.truncate(len(data))
+        for line in data.decode("UTF8", errors="replace").splitlines():
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(entry, list) and len(entry) == 4:
+                done.add(tuple(entry))
+        return done
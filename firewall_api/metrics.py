@@ -0,0 +1,157 @@
+# Standard library imports for metrics aggregation
+import bisect               # For histogram bucket lookup
+import json                 # For dumping snapshots
+import threading            # For safe use from several threads
+
+# Latency histogram bucket upper bounds in seconds (the last bucket is unbounded)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class MetricsCollector:
+    """
+    Aggregate Firewall request events into counters and latency histograms per entity and operation.
+    Attach it to one or more clients, run the job, then read snapshot(), dump() or prometheus().
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        """Initialize empty metrics with the given latency bucket bounds in seconds"""
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def attach(self, firewall):
+        """Start collecting events from a Firewall client"""
+        firewall.add_hook("post_response", self.record)
+        firewall.add_hook("error", self.record)
+        return self
+
+    def detach(self, firewall):
+        """Stop collecting events from a Firewall client"""
+        firewall.remove_hook("post_response", self.record)
+        firewall.remove_hook("error", self.record)
+
+    def record(self, event):
+        """Add one completed request event"""
+        key = (event["entity"], event["operation"])
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {
+                    "requests": 0,
+                    "errors": 0,
+                    "status_codes": {},
+                    "request_bytes": 0,
+                    "response_bytes": 0,
+                    "latency_sum": 0.0,
+                    "latency_max": 0.0,
+                    "latency_buckets": [0] * (len(self.buckets) + 1),
+                    "phase_sums": {},
+                }
+
+            series["requests"] += 1
+            if "error" in event:
+                series["errors"] += 1
+            status = str(event["status"])
+            series["status_codes"][status] = series["status_codes"].get(status, 0) + 1
+            series["request_bytes"] += event["request_bytes"]
+            series["response_bytes"] += event["response_bytes"]
+
+            elapsed = event["elapsed"]
+            series["latency_sum"] += elapsed
+            series["latency_max"] = max(series["latency_max"], elapsed)
+            series["latency_buckets"][bisect.bisect_left(self.buckets, elapsed)] += 1
+            for phase, seconds in event["timings"].items():
+                series["phase_sums"][phase] = series["phase_sums"].get(phase, 0.0) + seconds
+
+    def reset(self):
+        """Drop all collected metrics"""
+        with self._lock:
+            self._series.clear()
+
+    def snapshot(self):
+        """
+        Return metrics keyed by "entity/operation": counters, byte totals, latency sum/mean/max,
+        estimated p50/p99, cumulative histogram buckets and total seconds spent per phase.
+        """
+        with self._lock:
+            series_items = [
+                (
+                    key,
+                    dict(
+                        series,
+                        status_codes=dict(series["status_codes"]),
+                        latency_buckets=list(series["latency_buckets"]),
+                        phase_sums=dict(series["phase_sums"]),
+                    ),
+                )
+                for key, series in self._series.items()
+            ]
+
+        snapshot = {}
+        for (entity, operation), series in sorted(series_items):
+            requests = series["requests"]
+            cumulative, total = {}, 0
+            for bound, count in zip(self.buckets + (float("inf"),), series["latency_buckets"]):
+                total += count
+                cumulative["+Inf" if bound == float("inf") else str(bound)] = total
+
+            snapshot[f"{entity}/{operation}"] = {
+                "entity": entity,
+                "operation": operation,
+                "requests": requests,
+                "errors": series["errors"],
+                "status_codes": series["status_codes"],
+                "request_bytes": series["request_bytes"],
+                "response_bytes": series["response_bytes"],
+                "latency_sum": series["latency_sum"],
+                "latency_mean": series["latency_sum"] / requests if requests else 0.0,
+                "latency_max": series["latency_max"],
+                "latency_p50": self._quantile(series["latency_buckets"], requests, 0.50, series["latency_max"]),
+                "latency_p99": self._quantile(series["latency_buckets"], requests, 0.99, series["latency_max"]),
+                "latency_buckets": cumulative,
+                "phase_seconds": series["phase_sums"],
+            }
+        return snapshot
+
+    def dump(self, path=None):
+        """Return the snapshot as JSON text, also writing it to path when given"""
+        text = json.dumps(self.snapshot(), indent=4)
+        if path:
+            with open(path, mode="w", encoding="UTF8") as file:
+                file.write(text)
+        return text
+
+    def prometheus(self, prefix="firewall_api"):
+        """Return the metrics in Prometheus text exposition format"""
+        snapshot = self.snapshot().values()
+        lines = []
+        for name, field in (("requests_total", "requests"), ("errors_total", "errors"),
+                            ("request_bytes_total", "request_bytes"), ("response_bytes_total", "response_bytes")):
+            lines.append(f"# TYPE {prefix}_{name} counter")
+            for series in snapshot:
+                lines.append(f"{prefix}_{name}{{{self._labels(series)}}} {series[field]}")
+
+        lines.append(f"# TYPE {prefix}_request_duration_seconds histogram")
+        for series in snapshot:
+            labels = self._labels(series)
+            for bound, count in series["latency_buckets"].items():
+                lines.append(f'{prefix}_request_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f"{prefix}_request_duration_seconds_sum{{{labels}}} {series['latency_sum']}")
+            lines.append(f"{prefix}_request_duration_seconds_count{{{labels}}} {series['requests']}")
+        return "\n".join(lines) + "\n"
+
+    # Helper methods
+    def _labels(self, series):
+        """Prometheus label set of a series"""
+        return f'entity="{series["entity"]}",operation="{series["operation"]}"'
+
+    def _quantile(self, buckets, requests, fraction, latency_max):
+        """Estimate a latency quantile as the upper bound of the bucket that contains it"""
+        if not requests:
+            return 0.0
+        target, total = fraction * requests, 0
+        for bound, count in zip(self.buckets, buckets):
+            total += count
+            if total >= target:
+                return min(bound, latency_max)
+        return latency_max
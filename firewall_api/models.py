@@ -0,0 +1,166 @@
+# Slot-based record classes for the most common entity types.
+# Each record keeps its known fields in slots, the names of the fields it has (in response order)
+# as a tuple shared by all records with the same layout, and any other fields in a small dict.
+
+# Field layouts shared between records: (previous layout, added field) -> layout
+_LAYOUTS = {}
+
+
+def _extend_layout(layout, key):
+    """Return the shared layout tuple with key appended"""
+    extended = _LAYOUTS.get((layout, key))
+    if extended is None:
+        extended = _LAYOUTS[(layout, key)] = layout + (key,)
+    return extended
+
+
+class EntityModel:
+    """
+    Compact record of one entity, convertible to and from the dict form returned by Firewall.read.
+    Fields are attributes (host.IPAddress) and can also be used like dict keys (host["IPAddress"],
+    host.get("Subnet")). Nested values (lists, groups, policies) keep the dict/list form.
+    """
+
+    ENTITY = None
+    FIELDS = ()
+    __slots__ = ("_layout", "_extra")
+
+    def __init__(self, **fields):
+        """Create a record from field values given as keyword arguments"""
+        self._layout = ()
+        self._extra = None
+        for key, value in fields.items():
+            self[key] = value
+
+    @classmethod
+    def from_dict(cls, data):
+        """Create a record from its dict form; fields without a slot are kept as extra fields"""
+        record = cls.__new__(cls)
+        record._layout = ()
+        record._extra = None
+        for key, value in data.items():
+            record[key] = value
+        return record
+
+    def to_dict(self):
+        """Return the dict form, with the fields in their original order"""
+        return {key: self[key] for key in self._layout}
+
+    def copy(self):
+        """Return a copy whose nested values can be changed independently"""
+        from .cache import _copy  # Imported here, the cache module imports this one
+
+        return self.from_dict(_copy(self.to_dict()))
+
+    # Mapping-style access
+    def __getitem__(self, key):
+        if key in self.FIELDS:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self._extra is None:
+            raise KeyError(key)
+        return self._extra[key]
+
+    def __setitem__(self, key, value):
+        if key not in self._layout:
+            self._layout = _extend_layout(self._layout, key)
+        if key in self.FIELDS:
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __contains__(self, key):
+        return key in self._layout
+
+    def __iter__(self):
+        return iter(self._layout)
+
+    def __len__(self):
+        return len(self._layout)
+
+    def get(self, key, default=None):
+        """Value of a field, or default if the record does not have it"""
+        return self[key] if key in self._layout else default
+
+    def keys(self):
+        """Field names in their original order"""
+        return self._layout
+
+    def items(self):
+        """(field name, value) pairs in their original order"""
+        return [(key, self[key]) for key in self._layout]
+
+    def __eq__(self, other):
+        if isinstance(other, EntityModel):
+            return self.ENTITY == other.ENTITY and self.to_dict() == other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"{type(self).__name__}({', '.join(f'{key}={self[key]!r}' for key in self._layout)})"
+
+
+class IPHost(EntityModel):
+    """IP address, network, range or list object"""
+
+    ENTITY = "IPHost"
+    FIELDS = ("Name", "IPFamily", "HostType", "IPAddress", "Subnet", "StartIPAddress", "EndIPAddress",
+              "ListOfIPAddresses", "HostGroupList", "Description")
+    __slots__ = FIELDS
+
+
+class IPHostGroup(EntityModel):
+    """Group of IP hosts"""
+
+    ENTITY = "IPHostGroup"
+    FIELDS = ("Name", "IPFamily", "Description", "HostList")
+    __slots__ = FIELDS
+
+
+class FQDNHost(EntityModel):
+    """FQDN host object"""
+
+    ENTITY = "FQDNHost"
+    FIELDS = ("Name", "FQDN", "FQDNHostGroupList", "Description")
+    __slots__ = FIELDS
+
+
+class Services(EntityModel):
+    """Service definition (TCP/UDP ports, IP protocol or ICMP)"""
+
+    ENTITY = "Services"
+    FIELDS = ("Name", "Type", "ServiceDetails", "Description")
+    __slots__ = FIELDS
+
+
+class FirewallRule(EntityModel):
+    """Firewall rule"""
+
+    ENTITY = "FirewallRule"
+    FIELDS = ("Name", "Description", "IPFamily", "Status", "Position", "PolicyType", "After", "Before",
+              "NetworkPolicy", "UserPolicy", "HTTPBasedPolicy", "NonHTTPBasedPolicy")
+    __slots__ = FIELDS
+
+
+class LocalServiceACL(EntityModel):
+    """Local service ACL exception rule"""
+
+    ENTITY = "LocalServiceACL"
+    FIELDS = ("RuleName", "Description", "Position", "IPFamily", "SourceZone", "Hosts", "Services", "Action")
+    __slots__ = FIELDS
+
+
+# Record class of each supported entity type
+MODELS = {model.ENTITY: model for model in (IPHost, IPHostGroup, FQDNHost, Services, FirewallRule, LocalServiceACL)}
+
+
+def model_for(entity):
+    """Record class of an entity type, or None if it has none"""
+    return MODELS.get(entity)
@@ -0,0 +1,79 @@
+# Standard library imports for connection accounting
+import threading            # For counters shared by many threads
+
+# Third-party imports for HTTP connection pooling
+import requests.adapters    # For the adapter mounted on the client session
+import urllib3              # For the HTTPS connection and pool classes
+
+
+class ConnectionCounters:
+    """Thread-safe counts of requests sent and connections opened (TCP connect plus TLS handshake)"""
+
+    def __init__(self):
+        """Start from zero"""
+        self.requests = 0
+        self.connects = 0
+        self._lock = threading.Lock()
+
+    def add(self, requests=0, connects=0):
+        """Increase the counters"""
+        with self._lock:
+            self.requests += requests
+            self.connects += connects
+
+
+class CountingAdapter(requests.adapters.HTTPAdapter):
+    """
+    HTTPAdapter that records every request and every new HTTPS connection in a ConnectionCounters.
+    urllib3's own per-pool counters miss reconnects of a kept connection the server closed and are
+    lost when a pool is dropped, so connects are counted where they happen.
+    With keep_alive=False every connection is closed once its response has been received.
+    """
+
+    def __init__(self, counters, *args, keep_alive=True, **kwargs):
+        """Create the adapter; remaining arguments are those of HTTPAdapter"""
+        self.counters = counters
+        self.keep_alive = keep_alive
+        super().__init__(*args, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        """Create the pool manager with HTTPS pools whose connections report their connects"""
+        super().init_poolmanager(*args, **kwargs)
+        counters, keep_alive = self.counters, self.keep_alive
+
+        class CountingConnection(urllib3.connection.HTTPSConnection):
+            def connect(self):
+                super().connect()
+                counters.add(connects=1)
+
+            def getresponse(self):
+                response = super().getresponse()
+                if not keep_alive and self.sock is not None:
+                    # The response keeps the socket open until its body is read; the pool then sees
+                    # a dropped connection and opens a new one for the next request
+                    self.sock.close()
+                    self.sock = None
+                return response
+
+        class CountingPool(urllib3.HTTPSConnectionPool):
+            ConnectionCls = CountingConnection
+
+        self.poolmanager.pool_classes_by_scheme = dict(self.poolmanager.pool_classes_by_scheme, https=CountingPool)
+
+    def send(self, request, *args, **kwargs):
+        """Send a request, counting it"""
+        self.counters.add(requests=1)
+        return super().send(request, *args, **kwargs)
+
+    def idle_connections(self):
+        """Number of open connections waiting in the pools for reuse"""
+        idle = 0
+        manager = self.poolmanager
+        for key in manager.pools.keys():
+            try:
+                pool = manager.pools[key]
+            except KeyError:
+                continue  # Evicted meanwhile
+            if pool.pool is not None:
+                idle += sum(1 for connection in list(pool.pool.queue) if connection is not None and connection.sock is not None)
+        return idle
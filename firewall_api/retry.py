@@ -0,0 +1,119 @@
+# Standard library imports for retry and concurrency control
+import random               # For backoff jitter
+import threading            # For the shared concurrency limit
+import time                 # For backoff sleeps and latency tracking
+
+# Status codes produced by transient transport failures in Firewall._perform_action
+TRANSIENT_STATUSES = ("500", "503", "504")
+
+
+class RetryPolicy:
+    """
+    Retry settings for idempotent Firewall requests: reads, updates and removes by exact name.
+    Waits grow exponentially from backoff up to max_backoff, with full jitter.
+    """
+
+    def __init__(self, max_attempts=3, backoff=0.5, max_backoff=30.0, jitter=True, retry_statuses=TRANSIENT_STATUSES):
+        """Configure the number of attempts, backoff bounds in seconds, jitter and retried status codes"""
+        try:
+            max_attempts = int(max_attempts)
+            if max_attempts < 1:
+                raise ValueError("Attempts must be greater than 0")
+        except (TypeError, ValueError):
+            raise ValueError("max_attempts must be a valid number greater than 0")
+        try:
+            backoff = float(backoff)
+            max_backoff = float(max_backoff)
+            if backoff < 0 or max_backoff < backoff:
+                raise ValueError("Invalid backoff range")
+        except (TypeError, ValueError):
+            raise ValueError("backoff and max_backoff must be numbers with 0 <= backoff <= max_backoff")
+
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.retry_statuses = tuple(retry_statuses)
+
+    def should_retry(self, result, attempt):
+        """Return True if a result with a transient status may be retried after the given attempt (1-based)"""
+        return attempt < self.max_attempts and isinstance(result, dict) and result.get("status") in self.retry_statuses
+
+    def delay(self, attempt):
+        """Seconds to wait before the next attempt after the given attempt (1-based)"""
+        delay = min(self.max_backoff, self.backoff * (2 ** (attempt - 1)))
+        return random.uniform(0, delay) if self.jitter else delay
+
+    def sleep(self, attempt):
+        """Wait before the next attempt"""
+        time.sleep(self.delay(attempt))
+
+
+class AdaptiveLimiter:
+    """
+    Concurrency limit that adapts to the firewall's health (additive increase, multiplicative decrease).
+    Errors and responses much slower than the observed baseline shrink the limit; successful
+    fast responses grow it back one slot at a time, up to max_limit.
+    """
+
+    def __init__(self, initial_limit=4, min_limit=1, max_limit=32, decrease_factor=0.5, slow_factor=2.0, smoothing=0.1):
+        """
+        Configure limits. A response slower than slow_factor times the smoothed baseline latency counts
+        as a slowdown; smoothing is the weight of each new sample in that baseline.
+        """
+        try:
+            min_limit, max_limit, initial_limit = int(min_limit), int(max_limit), int(initial_limit)
+            if not (1 <= min_limit <= initial_limit <= max_limit):
+                raise ValueError("Limits must satisfy 1 <= min_limit <= initial_limit <= max_limit")
+        except (TypeError, ValueError):
+            raise ValueError("Limits must be numbers with 1 <= min_limit <= initial_limit <= max_limit")
+        if not (0 < decrease_factor < 1):
+            raise ValueError("decrease_factor must be between 0 and 1")
+
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.decrease_factor = decrease_factor
+        self.slow_factor = slow_factor
+        self.smoothing = smoothing
+
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._baseline = None
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self):
+        """Current number of requests allowed in flight"""
+        return int(self._limit)
+
+    @property
+    def in_flight(self):
+        """Number of requests currently in flight"""
+        return self._in_flight
+
+    def acquire(self):
+        """Block until a request slot is free, then take it"""
+        with self._condition:
+            while self._in_flight >= int(self._limit):
+                self._condition.wait()
+            self._in_flight += 1
+
+    def release(self, success, latency):
+        """Return a slot and adjust the limit from the request outcome and latency in seconds"""
+        with self._condition:
+            self._in_flight -= 1
+
+            slow = self._baseline is not None and latency > self._baseline * self.slow_factor
+            if success and not slow:
+                # Additive increase: roughly one extra slot per limit's worth of good responses
+                self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+            else:
+                self._limit = max(self.min_limit, self._limit * self.decrease_factor)
+
+            if success:
+                if self._baseline is None:
+                    self._baseline = latency
+                else:
+                    self._baseline += self.smoothing * (latency - self._baseline)
+
+            self._condition.notify_all()
@@ -0,0 +1,452 @@
+# Standard library imports for rule analysis
+import argparse             # For command line options
+import collections          # For resolved rules
+import heapq                # For the interval sweep
+
+# Local imports
+from .FirewallAPI import Firewall
+from .filters import field_values
+from .fleet import CONNECTION_FIELDS, load_connections
+from .ip_importer import parse_address
+from .ip_index import host_intervals
+from .services import merge_intervals, parse_ports
+
+# IPv4 and IPv6 addresses share one axis: IPv6 addresses start after the IPv4 space
+IPV6_OFFSET = 1 << 32
+FULL_RANGE = (0, IPV6_OFFSET + (1 << 128) - 1)
+FAMILY_RANGES = {4: (0, IPV6_OFFSET - 1), 6: (IPV6_OFFSET, FULL_RANGE[1])}
+
+# IPFamily values of a rule record
+IP_FAMILIES = {"ipv4": 4, "ipv6": 6}
+
+# Width of one protocol's destination ports on the service axis
+PORT_SPAN = 1 << 16
+
+# Object names meaning "any"
+ANY_NAMES = ("any",)
+
+# Resolved match conditions of a rule. family is the IP version the rule applies to (None when the
+# record does not say); "any" addresses only span that family. Zones are frozensets (None is any).
+# Addresses are (intervals, names) and services (boxes, names), with None for any; names hold
+# objects that could not be resolved to intervals, compared by name only. partial marks rules that
+# match only part of their traffic (a schedule or user identities), which never cover another rule.
+Rule = collections.namedtuple(
+    "Rule", "position name action family source_zones destination_zones sources destinations services partial"
+)
+
+
+class RuleAnalyzer:
+    """
+    Find shadowed, redundant and overlapping rules in Firewall.read("FirewallRule") output.
+    Networks are resolved through the IPHost and IPHostGroup records given, services through the
+    Services and ServiceGroup records; objects that cannot be resolved (FQDN hosts, built-in
+    services) are compared by name. Rules are evaluated top to bottom in the order given.
+
+    A rule is shadowed when an earlier enabled rule with another action matches all of its traffic,
+    so it never applies; it is redundant when the earlier rule has the same action. Two rules overlap
+    when they match some common traffic with different actions, so their order matters.
+
+    Rules of different IP families never match the same traffic.
+    Rules are grouped by IP family and zone pair, and within a group only rules whose intervals
+    intersect on one axis (source addresses, destination addresses or destination ports per protocol,
+    whichever has the fewest "any" rules) are compared, found with a sweep over the sorted intervals.
+    The cost is O(n log n) plus the number of candidate pairs. A rule that is "any" on the chosen axis
+    is a candidate with every rule of its group, so groups of rules that are "any" on all three axes
+    still approach pairwise comparison.
+    """
+
+    def __init__(self, rules, hosts=(), host_groups=(), services=(), service_groups=()):
+        """Resolve rules against the host, host group, service and service group records"""
+        self._hosts = {}
+        for record in hosts:
+            intervals = [_axis(interval) for interval in host_intervals(record)]
+            self._hosts[record.get("Name")] = intervals
+        self._groups = {}
+        for record in host_groups:
+            self._groups.setdefault(record.get("Name"), set()).update(field_values(record, "HostList.Host"))
+        for record in hosts:
+            for group in field_values(record, "HostGroupList.HostGroup"):
+                self._groups.setdefault(group, set()).add(record.get("Name"))
+        self._services = {record.get("Name"): record for record in services}
+        self._service_groups = {record.get("Name"): field_values(record, "ServiceList.Service") for record in service_groups}
+
+        self._protocols = {}  # Protocol -> position on the service axis
+        self.rules = []
+        self.skipped = []  # Names of disabled and non-network rules
+        for record in rules:
+            rule = self._resolve(record, len(self.rules) + len(self.skipped) + 1)
+            if rule is None:
+                self.skipped.append(record.get("Name"))
+            else:
+                self.rules.append(rule)
+
+    @classmethod
+    def from_firewall(cls, firewall):
+        """Read rules, hosts, host groups, services and service groups from a firewall and analyze them"""
+        data = {}
+        for entity in ("FirewallRule", "IPHost", "IPHostGroup", "Services", "ServiceGroup"):
+            response = firewall.read(entity)
+            if response["status"] not in ("216", "526"):
+                raise RuntimeError(f"Reading {entity} failed: {response['status']} {response['message']}")
+            data[entity] = response["data"]
+        return cls(data["FirewallRule"], data["IPHost"], data["IPHostGroup"], data["Services"], data["ServiceGroup"])
+
+    def analyze(self):
+        """
+        Return {"shadowed": [...], "redundant": [...], "overlapping": [...]}. Each finding names the
+        rule, the earlier rule involved ("by"), their positions and actions. A shadowed or redundant
+        rule is reported once, against the first earlier rule covering it, and not as overlapping.
+        """
+        pairs = sorted(self._candidate_pairs(), key=lambda pair: (pair[1], pair[0]))
+        covered = {}
+        overlaps = []
+        for first, second in pairs:
+            earlier, later = self.rules[first], self.rules[second]
+            if not _rules_intersect(earlier, later):
+                continue
+            if later.position not in covered and not earlier.partial and _rule_covers(earlier, later):
+                covered[later.position] = earlier
+            elif earlier.action != later.action:
+                overlaps.append((earlier, later))
+
+        report = {"shadowed": [], "redundant": [], "overlapping": []}
+        for rule in self.rules:
+            earlier = covered.get(rule.position)
+            if earlier is not None:
+                kind = "redundant" if earlier.action == rule.action else "shadowed"
+                report[kind].append(_finding(rule, earlier))
+        for earlier, later in overlaps:
+            if later.position not in covered:
+                report["overlapping"].append(_finding(later, earlier))
+        return report
+
+    # Helper methods
+    def _resolve(self, record, position):
+        """Resolve a rule record, or return None for disabled and non-network rules"""
+        if str(record.get("Status", "Enable")).lower() != "enable":
+            return None
+        policy = record.get("NetworkPolicy") or record.get("UserPolicy")
+        if not hasattr(policy, "get"):
+            return None
+        schedule = str(policy.get("Schedule") or "All The Time").strip().lower()
+        partial = schedule != "all the time" or bool(field_values(policy, "Identity.Member"))
+        return Rule(
+            position,
+            record.get("Name"),
+            str(policy.get("Action", "")).lower(),
+            IP_FAMILIES.get(str(record.get("IPFamily", "")).strip().lower()),
+            _zones(field_values(policy, "SourceZones.Zone")),
+            _zones(field_values(policy, "DestinationZones.Zone")),
+            self._addresses(field_values(policy, "SourceNetworks.Network")),
+            self._addresses(field_values(policy, "DestinationNetworks.Network")),
+            self._service_set(field_values(policy, "Services.Service")),
+            partial,
+        )
+
+    def _addresses(self, names):
+        """Resolve network object names to (merged intervals, unresolved names), or None for any"""
+        if not names or any(name.lower() in ANY_NAMES for name in names):
+            return None
+        intervals, unresolved = [], set()
+        for name in names:
+            found = self._host_intervals(name, set())
+            if found is None:
+                unresolved.add(name)
+            else:
+                intervals.extend(found)
+        return tuple(merge_intervals(intervals)), frozenset(unresolved)
+
+    def _host_intervals(self, name, visiting):
+        """Intervals of a host or (nested) host group, or None if it cannot be resolved"""
+        if name in self._hosts and self._hosts[name]:
+            return self._hosts[name]
+        if name in self._groups:
+            if name in visiting:
+                return []  # Group nested in itself
+            visiting.add(name)
+            intervals = []
+            for member in self._groups[name]:
+                found = self._host_intervals(member, visiting)
+                if found is None:
+                    return None
+                intervals.extend(found)
+            return intervals
+        try:
+            return [_axis(parse_address(name))]  # A literal address, network or range
+        except ValueError:
+            return None
+
+    def _service_set(self, names):
+        """Resolve service names to (boxes, unresolved names), or None for any"""
+        if not names or any(name.lower() in ANY_NAMES for name in names):
+            return None
+        boxes, unresolved = [], set()
+        for name in names:
+            found = self._service_boxes(name, set())
+            if found is None:
+                unresolved.add(name)
+            else:
+                boxes.extend(found)
+        return tuple(sorted(set(boxes))), frozenset(unresolved)
+
+    def _service_boxes(self, name, visiting):
+        """(protocol, source ports, destination ports) boxes of a TCP/UDP service or group, else None"""
+        if name in self._service_groups:
+            if name in visiting:
+                return []  # Group nested in itself
+            visiting.add(name)
+            boxes = []
+            for member in self._service_groups[name]:
+                found = self._service_boxes(member, visiting)
+                if found is None:
+                    return None
+                boxes.extend(found)
+            return boxes
+        record = self._services.get(name)
+        if record is None or record.get("Type") != "TCPorUDP":
+            return None
+        details = (record.get("ServiceDetails") or {}).get("ServiceDetail") or []
+        boxes = []
+        try:
+            for detail in details if isinstance(details, list) else [details]:
+                source = parse_ports(detail.get("SourcePort") or "1:65535")
+                boxes.append((str(detail["Protocol"]).upper(), source, parse_ports(detail["DestinationPort"])))
+        except (KeyError, TypeError, ValueError, AttributeError):
+            return None
+        return boxes
+
+    def _candidate_pairs(self):
+        """Index pairs (earlier, later) of rules sharing a family and zone pair whose intervals intersect on one axis"""
+        buckets = {}  # (source zone, destination zone), None for any -> rule indexes
+        for index, rule in enumerate(self.rules):
+            for source in rule.source_zones or (None,):
+                for destination in rule.destination_zones or (None,):
+                    buckets.setdefault((source, destination), []).append(index)
+
+        sources = {key[0] for key in buckets} | {None}
+        destinations = {key[1] for key in buckets} | {None}
+        families = {rule.family for rule in self.rules} - {None} or {None}
+        pairs = set()
+        for source in sources:
+            for destination in destinations:
+                # Rules meeting in this zone pair: those naming it and those with any zone on either side
+                members = set()
+                for key in {(source, destination), (None, destination), (source, None), (None, None)}:
+                    members.update(buckets.get(key, ()))
+                for family in families:
+                    # Rules without a family meet the rules of every family
+                    group = [index for index in sorted(members) if self.rules[index].family in (None, family)]
+                    if len(group) > 1:
+                        pairs.update(self._sweep(group))
+        return pairs
+
+    def _sweep(self, members):
+        """Pairs of members whose intervals intersect on the axis with the fewest unbounded members"""
+        best = None
+        for field in ("sources", "destinations", "services"):
+            intervals = [self._axis_intervals(field, self.rules[index]) for index in members]
+            unbounded = sum(1 for found in intervals if found is None)
+            if best is None or unbounded < best[0]:
+                best = (unbounded, field, intervals)
+        _, field, intervals = best
+
+        items = []
+        for index, found in zip(members, intervals):
+            if found is not None:
+                items.extend((low, high, index) for low, high in found)
+            elif field == "services":
+                items.append((0, len(self._protocols) * PORT_SPAN, index))
+            else:
+                items.append((*FAMILY_RANGES.get(self.rules[index].family, FULL_RANGE), index))
+        items.sort()
+
+        pairs = set()
+        active = []  # Heap of (high, index) of intervals still open
+        for low, high, index in items:
+            while active and active[0][0] < low:
+                heapq.heappop(active)
+            for _, other in active:
+                if other != index:
+                    pairs.add((min(index, other), max(index, other)))
+            heapq.heappush(active, (high, index))
+        return pairs
+
+    def _axis_intervals(self, field, rule):
+        """
+        Intervals of a rule on the sources, destinations or services axis, or None when they are
+        unbounded (any, or partly unresolved). Services map to destination ports offset by protocol.
+        """
+        value = getattr(rule, field)
+        if value is None or value[1] or not value[0]:
+            return None
+        if field != "services":
+            return value[0]
+        return [
+            (self._protocols.setdefault(protocol, len(self._protocols)) * PORT_SPAN + low,
+             self._protocols[protocol] * PORT_SPAN + high)
+            for protocol, _, (low, high) in value[0]
+        ]
+
+
+# Helper functions
+def _axis(interval):
+    """Map a (version, first, last) address interval to the shared IPv4/IPv6 axis"""
+    version, first, last = interval
+    offset = IPV6_OFFSET if version == 6 else 0
+    return first + offset, last + offset
+
+
+def _zones(names):
+    """Zone names as a frozenset, or None for any"""
+    if not names or any(name.lower() in ANY_NAMES for name in names):
+        return None
+    return frozenset(names)
+
+
+def _rules_intersect(first, second):
+    """Check whether two rules match some common traffic"""
+    return (
+        _families_intersect(first.family, second.family)
+        and _zones_intersect(first.source_zones, second.source_zones)
+        and _zones_intersect(first.destination_zones, second.destination_zones)
+        and _addresses_intersect(first.sources, second.sources, first.family, second.family)
+        and _addresses_intersect(first.destinations, second.destinations, first.family, second.family)
+        and _services_intersect(first.services, second.services)
+    )
+
+
+def _rule_covers(general, specific):
+    """Check whether general matches all traffic specific matches"""
+    return (
+        _family_covers(general.family, specific.family)
+        and _zones_cover(general.source_zones, specific.source_zones)
+        and _zones_cover(general.destination_zones, specific.destination_zones)
+        and _addresses_cover(general.sources, specific.sources)
+        and _addresses_cover(general.destinations, specific.destinations)
+        and _services_cover(general.services, specific.services)
+    )
+
+
+def _families_intersect(first, second):
+    return first is None or second is None or first == second
+
+
+def _family_covers(general, specific):
+    return general is None or general == specific
+
+
+def _zones_intersect(first, second):
+    return first is None or second is None or bool(first & second)
+
+
+def _zones_cover(general, specific):
+    return general is None or (specific is not None and specific <= general)
+
+
+def _addresses_intersect(first, second, first_family=None, second_family=None):
+    if first is None and second is None:
+        return True
+    if first is None or second is None:
+        # "any" only spans the addresses of its rule's family
+        family, other = (first_family, second) if first is None else (second_family, first)
+        return family is None or bool(other[1]) or _intervals_intersect([FAMILY_RANGES[family]], other[0])
+    return bool(first[1] & second[1]) or _intervals_intersect(first[0], second[0])
+
+
+def _addresses_cover(general, specific):
+    if general is None:
+        return True
+    if specific is None:
+        return False
+    return specific[1] <= general[1] and all(_interval_covered(interval, general[0]) for interval in specific[0])
+
+
+def _services_intersect(first, second):
+    if first is None or second is None:
+        return True
+    if first[1] & second[1]:
+        return True
+    return any(
+        protocol == other_protocol and _overlap(source, other_source) and _overlap(destination, other_destination)
+        for protocol, source, destination in first[0]
+        for other_protocol, other_source, other_destination in second[0]
+    )
+
+
+def _services_cover(general, specific):
+    if general is None:
+        return True
+    if specific is None:
+        return False
+    return specific[1] <= general[1] and all(
+        any(
+            protocol == other_protocol and _contains(other_source, source) and _contains(other_destination, destination)
+            for other_protocol, other_source, other_destination in general[0]
+        )
+        for protocol, source, destination in specific[0]
+    )
+
+
+def _intervals_intersect(first, second):
+    """Check whether two sorted, merged interval lists share a point"""
+    i = j = 0
+    while i < len(first) and j < len(second):
+        if _overlap(first[i], second[j]):
+            return True
+        if first[i][1] < second[j][1]:
+            i += 1
+        else:
+            j += 1
+    return False
+
+
+def _interval_covered(interval, intervals):
+    """Check whether one interval lies inside one of sorted, merged intervals"""
+    return any(_contains(candidate, interval) for candidate in intervals)
+
+
+def _overlap(first, second):
+    return first[0] <= second[1] and second[0] <= first[1]
+
+
+def _contains(outer, inner):
+    return outer[0] <= inner[0] and inner[1] <= outer[1]
+
+
+def _finding(rule, other):
+    """Report entry for a rule and the earlier rule involved"""
+    return {
+        "rule": rule.name,
+        "position": rule.position,
+        "action": rule.action,
+        "by": other.name,
+        "by_position": other.position,
+        "by_action": other.action,
+    }
+
+
+def main():
+    """Analyze the firewall rules of every firewall in config.ini"""
+    parser = argparse.ArgumentParser(description="Report shadowed, redundant and overlapping firewall rules")
+    parser.add_argument("config", help="config.ini with one section per firewall")
+    parser.add_argument("--section", action="append", help="Only analyze these config.ini sections")
+    args = parser.parse_args()
+
+    for connection in load_connections(args.config):
+        if args.section and connection["name"] not in args.section:
+            continue
+        with Firewall(*(connection[field] for field in CONNECTION_FIELDS)) as firewall:
+            try:
+                report = RuleAnalyzer.from_firewall(firewall).analyze()
+            except RuntimeError as e:
+                print(f"{connection['name']}: {e}")
+                continue
+        print(f"{connection['name']}: " + ", ".join(f"{len(findings)} {kind}" for kind, findings in report.items()))
+        for kind, findings in report.items():
+            for finding in findings:
+                print(f"  {kind:<12} #{finding['position']} {finding['rule']!r} ({finding['action']}) "
+                      f"by #{finding['by_position']} {finding['by']!r} ({finding['by_action']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+# Standard library imports for dependency-ordered writes
+import collections          # For the dependency graph
+from concurrent.futures import ThreadPoolExecutor
+
+# Local imports
+from .FirewallAPI import BATCH_SIZE, SUCCESS_CODES, entity_key_field
+from .filters import field_values
+from .jobs import EXISTS_STATUSES
+
+# Entity types a network, host or service reference may name
+NETWORK_ENTITIES = ("IPHost", "IPHostGroup", "FQDNHost", "FQDNHostGroup", "MACHost")
+SERVICE_ENTITIES = ("Services", "ServiceGroup")
+
+# Fields referring to other entities: entity type -> {dotted field path: entity types referred to}
+REFERENCES = {
+    "IPHost": {"HostGroupList.HostGroup": ("IPHostGroup",)},
+    "FQDNHost": {"FQDNHostGroupList.FQDNHostGroup": ("FQDNHostGroup",)},
+    "ServiceGroup": {"ServiceList.Service": ("Services",)},
+    "LocalServiceACL": {"Hosts.Host": NETWORK_ENTITIES},
+    "FirewallRule": {
+        "NetworkPolicy.SourceNetworks.Network": NETWORK_ENTITIES,
+        "NetworkPolicy.DestinationNetworks.Network": NETWORK_ENTITIES,
+        "NetworkPolicy.Services.Service": SERVICE_ENTITIES,
+        "UserPolicy.SourceNetworks.Network": NETWORK_ENTITIES,
+        "UserPolicy.DestinationNetworks.Network": NETWORK_ENTITIES,
+        "UserPolicy.Services.Service": SERVICE_ENTITIES,
+        "After.Name": ("FirewallRule",),
+        "Before.Name": ("FirewallRule",),
+    },
+}
+
+# Per-item statuses of items that were not sent
+FAILED_DEPENDENCY = "424"
+CIRCULAR_REFERENCE = ("508", "Part of, or depends on, a circular reference.")
+
+# Dependency plan of a set of items: waves of item indexes, indexes that cannot be ordered, and the
+# set of indexes each item depends on
+Plan = collections.namedtuple("Plan", "waves cyclic dependencies")
+
+
+class WriteScheduler:
+    """
+    Write a mixed set of entity payloads in dependency order. References between the payloads are
+    found through known fields (see REFERENCES), e.g. an IPHost's HostGroupList or a FirewallRule's
+    SourceNetworks. Referenced objects that are not part of the set are assumed to exist already.
+    Items are sent in waves: every wave holds the items whose dependencies were written by earlier
+    waves, and is sent as batches of one entity type, max_workers batches at a time. Items depending
+    on a failed item are not sent and get status 424; items in a reference cycle get status 508.
+    """
+
+    def __init__(self, firewall, batch_size=BATCH_SIZE, max_workers=4, references=REFERENCES):
+        """Configure the client, entities per request, batches sent in parallel and reference fields"""
+        try:
+            batch_size, max_workers = int(batch_size), int(max_workers)
+            if batch_size < 1 or max_workers < 1:
+                raise ValueError("Batch size and workers must be greater than 0")
+        except (TypeError, ValueError):
+            raise ValueError("batch_size and max_workers must be valid numbers greater than 0")
+
+        self.firewall = firewall
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.references = references
+
+    def plan(self, items):
+        """Order (entity, payload) pairs into waves; returns a Plan of item indexes"""
+        items = list(items)
+        indexes = {}  # (entity, name) -> indexes of the items defining it
+        for index, (entity, entity_data) in enumerate(items):
+            indexes.setdefault((entity, self._name(entity_data)), []).append(index)
+
+        dependencies = [set() for _ in items]
+        dependents = [[] for _ in items]
+        for index, (entity, entity_data) in enumerate(items):
+            for path, targets in self.references.get(entity, {}).items():
+                for name in field_values(entity_data, path):
+                    for target in targets:
+                        for dependency in indexes.get((target, name), ()):
+                            if dependency != index and dependency not in dependencies[index]:
+                                dependencies[index].add(dependency)
+                                dependents[dependency].append(index)
+
+        # Kahn's algorithm, one wave per level
+        waiting = [len(found) for found in dependencies]
+        waves = []
+        wave = [index for index, count in enumerate(waiting) if not count]
+        while wave:
+            waves.append(wave)
+            ready = []
+            for index in wave:
+                for dependent in dependents[index]:
+                    waiting[dependent] -= 1
+                    if not waiting[dependent]:
+                        ready.append(dependent)
+            wave = sorted(ready)
+
+        cyclic = [index for index, count in enumerate(waiting) if count]
+        return Plan(waves, cyclic, dependencies)
+
+    def run(self, items, operation="create"):
+        """
+        Create (or, with operation="update", update) every (entity, payload) pair in dependency order.
+        Returns a batch result whose per-item entries also hold the entity type and wave number.
+        """
+        if operation not in ("create", "update"):
+            raise ValueError("operation must be 'create' or 'update'")
+        items = list(items)
+        plan = self.plan(items)
+        results = [None] * len(items)
+        for index in plan.cyclic:
+            results[index] = self._item_result(items[index], None, *CIRCULAR_REFERENCE)
+
+        self.firewall.ensure_pool_size(self.max_workers)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="Scheduler") as executor:
+            for number, wave in enumerate(plan.waves, start=1):
+                groups = {}
+                for index in wave:
+                    failed = [dependency for dependency in sorted(plan.dependencies[index]) if not self._succeeded(results[dependency], operation)]
+                    if failed:
+                        entity, entity_data = items[failed[0]]
+                        message = f"Depends on {entity} '{self._name(entity_data)}', which was not written."
+                        results[index] = self._item_result(items[index], number, FAILED_DEPENDENCY, message)
+                    else:
+                        groups.setdefault(items[index][0], []).append(index)
+
+                batches = [
+                    (entity, indexes[start:start + self.batch_size])
+                    for entity, indexes in groups.items()
+                    for start in range(0, len(indexes), self.batch_size)
+                ]
+                send = lambda batch: self._send(operation, batch[0], [items[index][1] for index in batch[1]])
+                for (entity, indexes), response in zip(batches, executor.map(send, batches)):
+                    for index, result in zip(indexes, response["data"]):
+                        results[index] = dict(result, entity=entity, wave=number)
+
+        failed = sum(1 for result in results if not self._succeeded(result, operation))
+        if not failed:
+            return {
+                "status": "216",
+                "message": f"Operation completed successfully for {len(results)} entities in {len(plan.waves)} waves.",
+                "data": results,
+            }
+        return {
+            "status": "207",
+            "message": f"Operation failed for {failed} of {len(results)} entities.",
+            "data": results,
+        }
+
+    # Helper methods
+    def _send(self, operation, entity, payloads):
+        """Send one batch of payloads of one entity type"""
+        if operation == "update":
+            return self.firewall.update_many(entity, payloads, entity_key_field(entity), self.batch_size)
+        return self.firewall.create_many(entity, payloads, self.batch_size)
+
+    def _succeeded(self, result, operation):
+        """Check whether an item was written; on create an existing object (502) counts as written"""
+        return result["status"] in SUCCESS_CODES or (operation == "create" and result["status"] in EXISTS_STATUSES)
+
+    def _name(self, entity_data):
+        """Identifying name of a payload"""
+        if not hasattr(entity_data, "get"):
+            return None
+        return entity_data.get("Name", entity_data.get("RuleName"))
+
+    def _item_result(self, item, wave, status, message):
+        """Per-item result of an item that was not sent"""
+        return {"name": self._name(item[1]), "status": status, "message": message, "entity": item[0], "wave": wave}
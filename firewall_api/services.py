@@ -0,0 +1,118 @@
+# Standard library imports for service compilation
+import re                   # For port specs
+
+# Full port range, used when a ServiceDetail has no SourcePort
+PORT_MIN = 1
+PORT_MAX = 65535
+
+# Port spec: a port or a "low:high" range, with any spacing
+PORT_SPEC = re.compile(r"^\s*(\d+)\s*(?::\s*(\d+)\s*)?$")
+
+
+def parse_ports(spec):
+    """Parse a port spec such as "443", "1:65535" or "1     : 123" into a (low, high) interval"""
+    match = PORT_SPEC.match(str(spec))
+    if not match:
+        raise ValueError(f"Invalid port spec: {spec!r}")
+    low = int(match.group(1))
+    high = int(match.group(2)) if match.group(2) is not None else low
+    if not PORT_MIN <= low <= high <= PORT_MAX:
+        raise ValueError(f"Invalid port range: {spec!r}")
+    return low, high
+
+
+def format_ports(interval):
+    """Format a (low, high) interval as the firewall writes it: "443" or "1:65535\""""
+    low, high = interval
+    return str(low) if low == high else f"{low}:{high}"
+
+
+def merge_intervals(intervals):
+    """Merge overlapping and adjacent intervals, e.g. (1, 80), (81, 90), (85, 100) -> [(1, 100)]"""
+    merged = []
+    for low, high in sorted(intervals):
+        if merged and low <= merged[-1][1] + 1:
+            if high > merged[-1][1]:
+                merged[-1] = (merged[-1][0], high)
+        else:
+            merged.append((low, high))
+    return merged
+
+
+def compile_service(service):
+    """
+    Return a copy of a Services payload with merged ServiceDetails. TCP/UDP details are parsed into
+    port intervals; per protocol, destination ranges sharing a source range (and then source ranges
+    sharing a destination range) are merged when they overlap or touch. Other details (IP, ICMP) only
+    get their spacing normalized and lose duplicates. The result allows exactly the same traffic.
+    """
+    compiled = dict(service)
+    details = (service.get("ServiceDetails") or {}).get("ServiceDetail")
+    if details is None:
+        return compiled
+    if not isinstance(details, list):
+        details = [details]
+
+    ports, others = [], []
+    for detail in details:
+        if isinstance(detail, dict) and "Protocol" in detail and "DestinationPort" in detail:
+            protocol = str(detail["Protocol"]).strip().upper()
+            source = parse_ports(detail.get("SourcePort") or f"{PORT_MIN}:{PORT_MAX}")
+            ports.append((protocol, source, parse_ports(detail["DestinationPort"])))
+        else:
+            other = {key: _normalize(value) for key, value in detail.items()} if isinstance(detail, dict) else _normalize(detail)
+            if other not in others:
+                others.append(other)
+
+    result = [
+        {"SourcePort": format_ports(source), "DestinationPort": format_ports(destination), "Protocol": protocol}
+        for protocol, source, destination in _merge_ports(ports)
+    ] + others
+    compiled["ServiceDetails"] = {"ServiceDetail": result[0] if len(result) == 1 else result}
+    return compiled
+
+
+def compile_services(services):
+    """
+    Compile a set of Services payloads and drop those whose Type and compiled ServiceDetails equal an
+    earlier one. Returns (compiled payloads, {dropped name: name of the kept equal service}).
+    """
+    compiled, aliases, seen = [], {}, {}
+    for service in services:
+        service = compile_service(service)
+        key = (_normalize(service.get("Type")), repr(service.get("ServiceDetails")))
+        kept = seen.get(key)
+        if kept is not None:
+            aliases[service.get("Name")] = kept
+            continue
+        seen[key] = service.get("Name")
+        compiled.append(service)
+    return compiled, aliases
+
+
+# Helper functions
+def _merge_ports(ports):
+    """Merge (protocol, source, destination) intervals until no two can be combined"""
+    rules = set(ports)
+    while True:
+        merged = _merge_axis(_merge_axis(rules, 2), 1)
+        if merged == rules:
+            return sorted(rules)
+        rules = merged
+
+
+def _merge_axis(rules, axis):
+    """Merge the intervals on axis (1 source, 2 destination) of rules equal on the other fields"""
+    groups = {}
+    for rule in rules:
+        groups.setdefault(rule[:axis] + rule[axis + 1:], []).append(rule[axis])
+    merged = set()
+    for key, intervals in groups.items():
+        for interval in merge_intervals(intervals):
+            merged.add(key[:axis] + (interval,) + key[axis:])
+    return merged
+
+
+def _normalize(value):
+    """Trim a string value and collapse runs of whitespace ("Echo  Request" -> "Echo Request")"""
+    return " ".join(value.split()) if isinstance(value, str) else value
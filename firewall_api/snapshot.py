@@ -0,0 +1,247 @@
+# Standard library imports for the snapshot store
+import hashlib              # For content hashes of records
+import json                 # For record, manifest and change log files
+import os                   # For file layout and atomic replacement
+import threading            # For serializing commits within one process
+import time                 # For snapshot timestamps
+
+# Third-party imports for error handling
+import requests             # For network errors while streaming records
+
+# Local imports
+from .FirewallAPI import entity_key_field
+
+# Statuses of a successful read: records found, or none
+READ_OK = ("216", "526")
+
+
+def encode(value):
+    """Compact JSON bytes of a record or manifest, keeping key order"""
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def content_hash(data):
+    """SHA-256 hex digest of encoded content"""
+    return hashlib.sha256(data).hexdigest()
+
+
+class SnapshotStore:
+    """
+    Incremental, content-addressed store of configuration exports.
+    Each record is saved once under the hash of its content, each entity type has a manifest
+    mapping record names to hashes, and each snapshot maps entity types to manifest hashes.
+    A commit only writes the records and manifests that changed, appends one line to the change
+    log and moves HEAD. Reading a past snapshot loads its manifests directly, without replaying.
+
+    Layout under the store directory:
+        objects/ab/<hash>.json   records and entity manifests
+        snapshots/<id>.json      snapshot metadata and entity -> manifest hash
+        changes.jsonl            added/modified/removed names per entity, one line per snapshot
+        HEAD                     id of the latest snapshot
+    """
+
+    def __init__(self, path):
+        """Open (and create if needed) the store directory"""
+        self.path = path
+        self._objects = os.path.join(path, "objects")
+        self._snapshots = os.path.join(path, "snapshots")
+        self._changes = os.path.join(path, "changes.jsonl")
+        self._head = os.path.join(path, "HEAD")
+        os.makedirs(self._objects, exist_ok=True)
+        os.makedirs(self._snapshots, exist_ok=True)
+        self._lock = threading.Lock()
+
+    @property
+    def head(self):
+        """Id of the latest snapshot, or None for an empty store"""
+        try:
+            with open(self._head, "r", encoding="UTF8") as file:
+                return file.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    # Writing snapshots
+    def capture(self, firewall, entities, label=None):
+        """
+        Read each entity type from a Firewall client and commit the result as a snapshot.
+        Entity types whose read fails keep their previous records and are reported in "errors".
+        Each stream is read to the end before committing, so a network error part way through a
+        stream only drops that entity type instead of aborting the snapshot.
+        """
+        data, errors = {}, {}
+        for entity in entities:
+            response = firewall.read_iter(entity)
+            if response["status"] in READ_OK:
+                try:
+                    data[entity] = list(response["data"])
+                except requests.RequestException as e:
+                    error = firewall._request_error(e)
+                    errors[entity] = {"status": error["status"], "message": error["message"]}
+            else:
+                errors[entity] = {"status": response["status"], "message": response["message"]}
+        result = self.commit(data, label)
+        result["errors"] = errors
+        return result
+
+    def commit(self, data, label=None):
+        """
+        Commit {entity: iterable of records} as a new snapshot.
+        Entity types not in data keep their records from the previous snapshot; an empty list
+        removes all records of that type. Nothing is written when no record changed.
+        Returns {"snapshot", "parent", "timestamp", "changed", "changes"}.
+        """
+        with self._lock:
+            parent = self.head
+            parent_entities = self._load_snapshot(parent)["entities"] if parent else {}
+            entities = dict(parent_entities)
+            changes = {}
+
+            for entity, records in data.items():
+                previous_hash = parent_entities.get(entity)
+                previous = self._load_object(previous_hash) if previous_hash else {}
+                manifest = self._write_records(entity, records, previous)
+
+                entity_changes = self._compare(previous, manifest)
+                if not any(entity_changes.values()):
+                    continue
+                changes[entity] = entity_changes
+                entities[entity] = self._write_object(encode(manifest))
+
+            timestamp = time.time()
+            if not changes:
+                return {"snapshot": parent, "parent": parent, "timestamp": timestamp, "changed": False, "changes": {}}
+
+            snapshot_id = self._next_id(parent)
+            snapshot = {"id": snapshot_id, "parent": parent, "timestamp": timestamp, "label": label, "entities": entities}
+            self._write_file(os.path.join(self._snapshots, f"{snapshot_id}.json"), encode(snapshot))
+            with open(self._changes, "a", encoding="UTF8") as file:
+                file.write(json.dumps({"snapshot": snapshot_id, "timestamp": timestamp, "changes": changes}) + "\n")
+            self._write_file(self._head, snapshot_id.encode())
+
+        return {"snapshot": snapshot_id, "parent": parent, "timestamp": timestamp, "changed": True, "changes": changes}
+
+    # Reading snapshots
+    def snapshots(self):
+        """Metadata of all snapshots, oldest first, without their entity maps"""
+        result = []
+        for file_name in sorted(os.listdir(self._snapshots)):
+            if file_name.endswith(".json"):
+                snapshot = self._load_snapshot(file_name[:-5])
+                del snapshot["entities"]
+                result.append(snapshot)
+        return result
+
+    def as_of(self, timestamp):
+        """Id of the latest snapshot taken at or before timestamp (seconds since the epoch), or None"""
+        found = None
+        for snapshot in self.snapshots():
+            if snapshot["timestamp"] > timestamp:
+                break
+            found = snapshot["id"]
+        return found
+
+    def entities(self, snapshot=None):
+        """Entity types stored in a snapshot (default: HEAD)"""
+        snapshot = snapshot or self.head
+        return list(self._load_snapshot(snapshot)["entities"]) if snapshot else []
+
+    def manifest(self, entity, snapshot=None):
+        """Record name -> content hash of one entity type in a snapshot (default: HEAD)"""
+        snapshot = snapshot or self.head
+        if not snapshot:
+            return {}
+        manifest_hash = self._load_snapshot(snapshot)["entities"].get(entity)
+        return self._load_object(manifest_hash) if manifest_hash else {}
+
+    def read(self, entity, snapshot=None):
+        """Records of one entity type as of a snapshot (default: HEAD), in their exported order"""
+        return [self._load_object(record_hash) for record_hash in self.manifest(entity, snapshot).values()]
+
+    def read_all(self, snapshot=None):
+        """{entity: records} of every entity type in a snapshot (default: HEAD)"""
+        return {entity: self.read(entity, snapshot) for entity in self.entities(snapshot)}
+
+    def diff(self, old, new=None, entity=None):
+        """Added/modified/removed record names per entity type between two snapshots (new defaults to HEAD)"""
+        new = new or self.head
+        entities = [entity] if entity else sorted(set(self.entities(old)) | set(self.entities(new)))
+        result = {}
+        for name in entities:
+            changes = self._compare(self.manifest(name, old), self.manifest(name, new))
+            if any(changes.values()):
+                result[name] = changes
+        return result
+
+    def changes(self, since=None, until=None):
+        """Change log entries after snapshot since up to and including snapshot until"""
+        try:
+            with open(self._changes, "r", encoding="UTF8") as file:
+                for line in file:
+                    if not line.strip():
+                        continue
+                    entry = json.loads(line)
+                    if since is not None and entry["snapshot"] <= since:
+                        continue
+                    if until is not None and entry["snapshot"] > until:
+                        break
+                    yield entry
+        except FileNotFoundError:
+            return
+
+    # Helper methods
+    def _write_records(self, entity, records, previous):
+        """Store new record contents and return the entity manifest (name -> hash)"""
+        key_field = entity_key_field(entity)
+        manifest = {}
+        for index, record in enumerate(records):
+            name = str(record.get(key_field) or f"#{index}") if isinstance(record, dict) else f"#{index}"
+            if name in manifest:
+                name = f"{name}#{index}"
+            data = encode(record)
+            record_hash = content_hash(data)
+            if previous.get(name) != record_hash:
+                self._write_object(data, record_hash)
+            manifest[name] = record_hash
+        return manifest
+
+    def _compare(self, old, new):
+        """Names added, modified and removed between two manifests"""
+        return {
+            "added": [name for name in new if name not in old],
+            "modified": [name for name, record_hash in new.items() if name in old and old[name] != record_hash],
+            "removed": [name for name in old if name not in new],
+        }
+
+    def _object_path(self, object_hash):
+        """File path of a stored object"""
+        return os.path.join(self._objects, object_hash[:2], f"{object_hash}.json")
+
+    def _write_object(self, data, object_hash=None):
+        """Store content under its hash unless already present, returning the hash"""
+        object_hash = object_hash or content_hash(data)
+        path = self._object_path(object_hash)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self._write_file(path, data)
+        return object_hash
+
+    def _load_object(self, object_hash):
+        """Load a stored record or manifest"""
+        with open(self._object_path(object_hash), "rb") as file:
+            return json.loads(file.read())
+
+    def _load_snapshot(self, snapshot_id):
+        """Load snapshot metadata"""
+        with open(os.path.join(self._snapshots, f"{snapshot_id}.json"), "rb") as file:
+            return json.loads(file.read())
+
+    def _next_id(self, parent):
+        """Zero-padded sequence number following the parent snapshot"""
+        return f"{int(parent) + 1 if parent else 1:08d}"
+
+    def _write_file(self, path, data):
+        """Write a file atomically"""
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as file:
+            file.write(data)
+        os.replace(temp_path, path)
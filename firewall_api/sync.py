@@ -0,0 +1,130 @@
+# Local imports
+from .FirewallAPI import BATCH_SIZE, LIKE, entity_key_field
+from .cache import _copy
+
+
+def normalize(value):
+    """
+    Normalize an entity value for comparison.
+    Strings are stripped, numbers and booleans compared as the text the API returns,
+    single-item lists equal their item and list order is ignored.
+    """
+    if isinstance(value, dict):
+        return {key: normalize(item) for key, item in value.items() if key != "@transactionid"}
+    if isinstance(value, (list, tuple)):
+        items = [normalize(item) for item in value]
+        if len(items) == 1:
+            return items[0]
+        return sorted(items, key=repr)
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if value is None:
+        return None
+    return str(value).strip()
+
+
+def differs(desired, current):
+    """Return True if any field set in desired has a different value in current"""
+    if isinstance(desired, dict) and isinstance(current, dict):
+        return any(differs(value, current.get(key)) for key, value in desired.items())
+    return desired != current
+
+
+class SyncEngine:
+    """
+    Bring the objects of one entity type on the firewall in line with a desired list.
+    The current state is read once, compared field by field with the desired objects and
+    only the resulting adds, updates and removes are sent, in batches.
+    """
+
+    def __init__(self, firewall, batch_size=BATCH_SIZE):
+        """Initialize the engine with a Firewall client and the batch size used to apply plans"""
+        self.firewall = firewall
+        self.batch_size = batch_size
+
+    def plan(self, entity, desired, prefix=None, key_field=None):
+        """
+        Compute the changes needed for entity to match desired.
+        Objects are matched by key_field (Name, or RuleName for LocalServiceACL). Only objects whose
+        key starts with prefix are managed: existing ones missing from desired are removed.
+        Without a prefix, nothing is removed. Returns a plan dict, or a status dict if the read failed.
+        """
+        key_field = key_field or entity_key_field(entity)
+
+        desired_by_key = {}
+        for entity_data in desired:
+            if not isinstance(entity_data, dict) or not entity_data.get(key_field):
+                return {"status": "400", "message": f"Each desired object must be a dictionary with a '{key_field}' field.", "data": []}
+            if prefix and not str(entity_data[key_field]).startswith(prefix):
+                return {"status": "400", "message": f"Desired object '{entity_data[key_field]}' does not start with prefix '{prefix}'.", "data": []}
+            if entity == "Services":
+                # Compare against the payload create() would actually send
+                entity_data = self.firewall._remove_spaces(_copy(entity_data))
+            desired_by_key[entity_data[key_field]] = entity_data
+
+        # One read of the managed objects, filtered by prefix on the firewall where possible
+        response = self.firewall.read_iter(entity, prefix, LIKE, key_field) if prefix else self.firewall.read_iter(entity)
+        if response["status"] not in ("216", "526"):
+            return response
+
+        current_by_key = {}
+        for record in response["data"]:
+            key = record.get(key_field)
+            if prefix and not str(key).startswith(prefix):
+                continue
+            if key in desired_by_key or prefix:
+                current_by_key[key] = record
+
+        create, update, unchanged = [], [], []
+        for key, entity_data in desired_by_key.items():
+            if key not in current_by_key:
+                create.append(entity_data)
+            elif differs(normalize(entity_data), normalize(current_by_key[key])):
+                update.append(entity_data)
+            else:
+                unchanged.append(key)
+
+        delete = [key for key in current_by_key if key not in desired_by_key] if prefix else []
+
+        return {
+            "entity": entity,
+            "key_field": key_field,
+            "create": create,
+            "update": update,
+            "delete": delete,
+            "unchanged": unchanged,
+            "current": [current_by_key[entity_data[key_field]] for entity_data in update],
+        }
+
+    def apply(self, plan):
+        """Apply a plan, sending only its adds, updates and removes. Returns a result per change type"""
+        if "entity" not in plan:
+            return plan
+
+        entity, key_field = plan["entity"], plan["key_field"]
+        results = {}
+        if plan["create"]:
+            results["create"] = self.firewall.create_many(entity, plan["create"], self.batch_size)
+        if plan["update"]:
+            results["update"] = self.firewall.update_many(entity, plan["update"], key_field, self.batch_size, plan["current"])
+        if plan["delete"]:
+            results["delete"] = self.firewall.delete_many(entity, plan["delete"], self.batch_size)
+
+        failed = [change for change, result in results.items() if result["status"] != "216"]
+        if failed:
+            return {"status": "207", "message": f"Sync failed for: {', '.join(failed)}", "data": results}
+        return {"status": "216", "message": self.summary(plan), "data": results}
+
+    def sync(self, entity, desired, prefix=None, key_field=None, dry_run=False):
+        """Plan and apply in one call. With dry_run, return the plan without changing anything"""
+        plan = self.plan(entity, desired, prefix, key_field)
+        if dry_run or "entity" not in plan:
+            return plan
+        return self.apply(plan)
+
+    def summary(self, plan):
+        """Describe a plan in one line"""
+        return (
+            f"{plan['entity']}: {len(plan['create'])} to create, {len(plan['update'])} to update, "
+            f"{len(plan['delete'])} to delete, {len(plan['unchanged'])} unchanged"
+        )
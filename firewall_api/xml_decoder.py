@@ -0,0 +1,183 @@
+# Standard library imports for response decoding
+import threading            # For per-thread lxml parsers
+import xml.parsers.expat    # For the fallback parser
+
+# Local imports
+from .xml_stream import push_value  # For turning repeated elements into lists
+
+# Optional faster parser
+try:
+    from lxml import etree  # For parsing with lxml when it is installed
+except ImportError:
+    etree = None
+
+PARSER = "lxml" if etree is not None else "expat"
+
+_local = threading.local()
+
+
+def compile_fields(fields):
+    """
+    Turn dotted field paths into a selector tree, e.g. ["Name", "ServiceDetails.ServiceDetail.Protocol"]
+    gives {"Name": {}, "ServiceDetails": {"ServiceDetail": {"Protocol": {}}}, "Status": {}}.
+    An empty dict selects the whole element. Status is always kept so error responses are still recognized.
+    """
+    if isinstance(fields, str):
+        fields = [fields]
+    selector = {"Status": {}}
+    for field in fields:
+        node = selector
+        keys = field.split(".")
+        for key in keys[:-1]:
+            child = node.get(key)
+            if child == {}:
+                break  # A parent path already selects the whole element
+            node = node.setdefault(key, {})
+        else:
+            node[keys[-1]] = {}
+    return selector
+
+
+def decode(content, entity=None, fields=None, parser=None, model=None):
+    """
+    Parse a response body (bytes) into the same structure as xmltodict.parse(content.decode()).
+    With fields, only those dotted paths (see compile_fields) are built for the root's children named entity.
+    With model (an EntityModel class), those children are built directly as model records, without
+    their transactionid attribute. parser is "lxml" or "expat", defaulting to lxml when it is installed.
+    lxml resolves namespaces ({uri}tag names, no @xmlns attributes) and rejects undeclared prefixes,
+    unlike xmltodict, so documents declaring namespaces or failing to parse with lxml use expat.
+    """
+    selector = compile_fields(fields) if fields else None
+    if (parser or PARSER) == "lxml" and b"xmlns" not in content:
+        try:
+            return _decode_lxml(content, entity, selector, model)
+        except etree.XMLSyntaxError:
+            pass  # E.g. an undeclared prefix; expat reports documents that are not well-formed
+    return _decode_expat(content, entity, selector, model)
+
+
+def _new_record(model, attributes):
+    """Create an empty model record with the element's attributes, except transactionid"""
+    record = model()
+    for key, value in attributes.items():
+        if key != "transactionid":
+            record["@" + key] = value
+    return record
+
+
+def _decode_lxml(content, entity, selector, model):
+    """Parse with lxml and convert the element tree"""
+    parser = getattr(_local, "parser", None)
+    if parser is None:
+        parser = _local.parser = etree.XMLParser(
+            resolve_entities=False, no_network=True, remove_comments=True, remove_pis=True, huge_tree=True
+        )
+    root = etree.fromstring(content, parser)
+    return {root.tag: _element_value(root, None, entity, selector, model)}
+
+
+def _element_value(element, selector, entity=None, entity_selector=None, model=None, record=None):
+    """
+    Convert an lxml element to xmltodict's structure, keeping only the children in selector (None keeps all).
+    Children named entity use entity_selector and are built as model records when model is given.
+    """
+    attributes = element.attrib
+    if record is not None:
+        item = record
+    else:
+        item = {"@" + key: value for key, value in attributes.items()} if attributes else None
+    text = [element.text] if element.text else []
+
+    for child in element:
+        if child.tail:
+            text.append(child.tail)
+        name = child.tag
+        if not isinstance(name, str):
+            continue
+        child_record = None
+        if entity is not None and name == entity:
+            child_selector = entity_selector
+            if model is not None:
+                child_record = _new_record(model, child.attrib)
+        elif selector is None:
+            child_selector = None
+        elif name in selector:
+            child_selector = selector[name] or None
+        else:
+            continue
+        if item is None:
+            item = {}
+        push_value(item, name, _element_value(child, child_selector, record=child_record))
+
+    text = "".join(text).strip() if text else ""
+    if item is None:
+        return text or None
+    if text:
+        item["#text"] = text
+    return item
+
+
+def _decode_expat(content, entity, selector, model):
+    """Parse with expat, building only the selected elements"""
+    parser = xml.parsers.expat.ParserCreate()
+    parser.buffer_text = True
+    stack = []  # Each entry is [name, item dict or None, list of text chunks, selector]
+    document = {}
+    skipped = 0  # Depth inside an element left out by the selector
+
+    def start_element(name, attrs):
+        nonlocal skipped
+        if skipped:
+            skipped += 1
+            return
+        item = None
+        if not stack:
+            child_selector = None
+        elif len(stack) == 1 and name == entity and (selector is not None or model is not None):
+            child_selector = selector
+            if model is not None:
+                item = _new_record(model, attrs)
+        else:
+            parent_selector = stack[-1][3]
+            if parent_selector is None:
+                child_selector = None
+            elif name in parent_selector:
+                child_selector = parent_selector[name] or None
+            else:
+                skipped = 1
+                return
+        if item is None and attrs:
+            item = {"@" + key: value for key, value in attrs.items()}
+        stack.append([name, item, [], child_selector])
+
+    def characters(data):
+        if not skipped and stack:
+            stack[-1][2].append(data)
+
+    def end_element(name):
+        nonlocal skipped
+        if skipped:
+            skipped -= 1
+            return
+        _, item, data, _ = stack.pop()
+        text = "".join(data).strip() if data else ""
+        if item is None:
+            value = text or None
+        else:
+            if text:
+                item["#text"] = text
+            value = item
+
+        if stack:
+            parent = stack[-1]
+            if parent[1] is None:
+                parent[1] = {}
+            push_value(parent[1], name, value)
+        else:
+            document[name] = value
+
+    parser.StartElementHandler = start_element
+    parser.EndElementHandler = end_element
+    parser.CharacterDataHandler = characters
+    parser.Parse(content, True)
+    return document
@@ -0,0 +1,76 @@
+# Standard library imports for XML output
+from xml.sax.saxutils import quoteattr  # For attribute quoting, identical to xmltodict's output
+
+
+def escape(text):
+    """Escape &, < and > in character data"""
+    if "&" in text:
+        text = text.replace("&", "&amp;")
+    if ">" in text:
+        text = text.replace(">", "&gt;")
+    if "<" in text:
+        text = text.replace("<", "&lt;")
+    return text
+
+
+def to_text(value):
+    """Convert a scalar value to its XML text the way xmltodict does (booleans as true/false)"""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value).decode("utf-8", errors="replace")
+    return str(value)
+
+
+def serialize(data):
+    """
+    Serialize an entity dict to XML, producing the same text as
+    xmltodict.unparse(data, full_document=False).
+    Keys starting with "@" become attributes, "#text" becomes character data, None becomes an
+    empty element and lists become repeated elements, e.g. {"Zone": ["LAN", "WAN"]} gives
+    <Zone>LAN</Zone><Zone>WAN</Zone>.
+    """
+    parts = []
+    for key, value in data.items():
+        _emit(key, value, parts)
+    return "".join(parts)
+
+
+def _emit(key, value, parts):
+    """Append the XML of one key and its value (repeated for lists) to parts"""
+    if isinstance(value, (str, bytes, bytearray, memoryview, dict)) or not hasattr(value, "__iter__"):
+        value = (value,)
+
+    for item in value:
+        # Fast path for the common scalar leaf
+        if isinstance(item, str):
+            parts.append(f"<{key}>{escape(item)}</{key}>" if item else f"<{key}></{key}>")
+            continue
+        if item is None:
+            parts.append(f"<{key}></{key}>")
+            continue
+        if not isinstance(item, dict):
+            text = to_text(item)
+            parts.append(f"<{key}>{escape(text)}</{key}>" if text else f"<{key}></{key}>")
+            continue
+
+        text = None
+        attributes = []
+        children = []
+        for child_key, child_value in item.items():
+            if child_key == "#text":
+                text = None if child_value is None else to_text(child_value)
+            elif isinstance(child_key, str) and child_key.startswith("@"):
+                attribute = "" if child_value is None else to_text(child_value)
+                attributes.append(f" {child_key[1:]}={quoteattr(attribute)}")
+            elif not (isinstance(child_value, list) and not child_value):
+                children.append((child_key, child_value))
+
+        parts.append(f"<{key}{''.join(attributes)}>")
+        for child_key, child_value in children:
+            _emit(child_key, child_value, parts)
+        if text:
+            parts.append(escape(text))
+        parts.append(f"</{key}>")
@@ -0,0 +1,76 @@
+# Standard library imports for incremental XML parsing
+import collections          # For the queue of completed items
+import xml.parsers.expat    # For the incremental (push) XML parser
+
+
+class ItemParser:
+    """
+    Incremental XML parser that builds the children of the root element one at a time.
+    Each child is converted to the same structure xmltodict.parse produces: attributes as
+    "@name" keys, text as "#text" (or the plain value for leaf elements) and repeated
+    elements as lists.
+    """
+
+    def __init__(self):
+        """Create the expat parser and the element stack"""
+        self._parser = xml.parsers.expat.ParserCreate()
+        self._parser.buffer_text = True
+        self._parser.StartElementHandler = self._start_element
+        self._parser.EndElementHandler = self._end_element
+        self._parser.CharacterDataHandler = self._characters
+
+        # Each stack entry is [name, item dict or None, list of text chunks]
+        self._stack = []
+        self.items = collections.deque()
+
+    def feed(self, data):
+        """Feed a chunk of the document and collect the children of the root completed so far"""
+        self._parser.Parse(data, False)
+
+    def close(self):
+        """Signal the end of the document"""
+        self._parser.Parse(b"", True)
+
+    # Expat handlers
+    def _start_element(self, name, attrs):
+        """Open a new element"""
+        item = {"@" + key: value for key, value in attrs.items()} if attrs else None
+        self._stack.append([name, item, []])
+
+    def _characters(self, data):
+        """Collect text of the current element"""
+        if self._stack:
+            self._stack[-1][2].append(data)
+
+    def _end_element(self, name):
+        """Close the current element and attach it to its parent"""
+        _, item, data = self._stack.pop()
+        text = "".join(data).strip() if data else ""
+
+        if item is None:
+            value = text or None
+        else:
+            if text:
+                item["#text"] = text
+            value = item
+
+        if len(self._stack) == 1:
+            # Direct child of the root element - hand it out instead of keeping it
+            self.items.append((name, value))
+        elif self._stack:
+            parent = self._stack[-1]
+            if parent[1] is None:
+                parent[1] = {}
+            push_value(parent[1], name, value)
+
+
+def push_value(item, key, value):
+    """Add a child value to an element dict, turning repeated keys into lists"""
+    if key in item:
+        existing = item[key]
+        if isinstance(existing, list):
+            existing.append(value)
+        else:
+            item[key] = [existing, value]
+    else:
+        item[key] = value
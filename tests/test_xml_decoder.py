@@ -0,0 +1,33 @@
+# Standard library imports for the decoder tests
+import unittest             # For the test cases
+
+# Third-party imports
+import xmltodict            # Reference parser
+
+# Local imports
+from firewall_api.xml_decoder import PARSER, decode
+
+# Response bodies compared with xmltodict.parse, including namespaced and prefixed names
+DOCUMENTS = {
+    "records": b'<Response APIVersion="2000.1"><IPHost transactionid=""><Name>A &amp; B</Name><HostList><Host>1</Host><Host>2</Host></HostList></IPHost><IPHost><Name>C</Name><Description/></IPHost></Response>',
+    "status": b'<Response><Status code="529">Input request file is invalid.</Status></Response>',
+    "mixed_text": b"<Response><Status>Enable<Code>200</Code> done</Status></Response>",
+    "prefixed_namespace": b'<B xmlns:n="u"><n:C>1</n:C></B>',
+    "default_namespace": b'<B xmlns="u" a="1"><C>1</C></B>',
+    "namespaced_attribute": b'<B xmlns:n="u"><C n:x="1">2</C></B>',
+    "undeclared_prefix": b"<B><n:C>1</n:C></B>",
+}
+
+
+class DecodeTest(unittest.TestCase):
+    """decode() must produce the structure of xmltodict.parse with either parser"""
+
+    def test_matches_xmltodict(self):
+        for parser in ("expat", PARSER):
+            for name, content in DOCUMENTS.items():
+                with self.subTest(parser=parser, document=name):
+                    self.assertEqual(decode(content, parser=parser), xmltodict.parse(content.decode()))
+
+
+if __name__ == "__main__":
+    unittest.main()
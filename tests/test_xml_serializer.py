@@ -0,0 +1,59 @@
+# Standard library imports for the serializer tests
+import unittest             # For the test cases
+
+# Third-party imports
+import xmltodict            # Reference serializer
+
+# Local imports
+from firewall_api.xml_serializer import serialize
+
+# Entity dicts covering the value shapes handled by serialize, each compared with xmltodict's output
+CASES = {
+    "none": {"Description": None},
+    "empty_string": {"Description": ""},
+    "empty_dict": {"HostList": {}},
+    "empty_list": {"Name": "Group", "HostList": []},
+    "nested_empty_list": {"Group": {"HostList": {"Host": []}, "Name": "Group"}},
+    "empty_list_in_list": {"Zone": ["LAN", [], "WAN"]},
+    "list": {"Zone": ["LAN", "WAN"]},
+    "list_of_dicts": {"ServiceDetail": [{"DestinationPort": "80", "Protocol": "TCP"}, {"DestinationPort": "443", "Protocol": "TCP"}]},
+    "list_with_none": {"Host": ["Host_1", None, "Host_2"]},
+    "tuple": {"Zone": ("LAN", "WAN")},
+    "bool": {"Enabled": True, "Disabled": False},
+    "int": {"Count": 3, "Zero": 0, "Negative": -1},
+    "float": {"Ratio": 0.5, "Large": 1e20},
+    "bytes": {"Name": b"Host_1", "Description": bytearray(b"caf\xc3\xa9")},
+    "text_alone": {"Status": {"#text": "Enable"}},
+    "text_with_children": {"Status": {"#text": "Enable", "Code": "200"}},
+    "text_with_attribute": {"Status": {"@code": "200", "#text": "Configuration applied successfully."}},
+    "text_none": {"Status": {"@code": "200", "#text": None}},
+    "text_number": {"Status": {"#text": 200}},
+    "attribute_none": {"Set": {"@operation": None, "IPHost": {"Name": "Host_1"}}},
+    "attribute_number": {"Set": {"@count": 3, "@flag": True}},
+    "attribute_quotes": {"Set": {"@operation": "up\"date'", "IPHost": {"Name": "Host_1"}}},
+    "attribute_whitespace": {"Set": {"@note": "tab\there\nnewline\rreturn"}},
+    "attribute_markup": {"Set": {"@note": "<a> & b"}},
+    "text_markup": {"Name": "Host <1> & \"2\" 'x'"},
+    "text_cdata_end": {"Description": "a]]>b"},
+    "text_whitespace": {"Description": "  tab\there\nnewline  "},
+    "unicode": {"Description": "Zürich – 東京"},
+    "deep": {"NetworkPolicy": {"SourceZones": {"Zone": ["LAN", "DMZ"]}, "Services": {"Service": "HTTP"}, "Schedule": None}},
+}
+
+
+class SerializeTest(unittest.TestCase):
+    """serialize() must produce exactly the text of xmltodict.unparse(data, full_document=False)"""
+
+    def test_matches_xmltodict(self):
+        for name, data in CASES.items():
+            with self.subTest(name):
+                self.assertEqual(serialize(data), xmltodict.unparse(data, full_document=False))
+
+    def test_batched_set(self):
+        hosts = [{"Name": f"Host_{number}", "IPFamily": "IPv4", "HostType": "IP", "IPAddress": f"10.0.0.{number}"} for number in range(50)]
+        data = {"Set": {"@operation": "add", "IPHost": hosts}}
+        self.assertEqual(serialize(data), xmltodict.unparse(data, full_document=False))
+
+
+if __name__ == "__main__":
+    unittest.main()